@@ -0,0 +1,188 @@
+"""Rule-based auto-categorization.
+
+A ``Categorizer`` is compiled once per user from their categorization rules
+and learned mappings and then classifies descriptions without looping over
+rules:
+
+* learned mappings: the user's own earlier choices, keyed by the normalized
+  description (lowercase letters only, so dates, reference and store
+  numbers do not matter), are a single dict lookup;
+* keyword rules are merged into one trie-shaped regular expression, so the
+  scan costs about one step per character however many keywords there are
+  (Aho–Corasick style, executed by the C regex engine). The trie sits in a
+  lookahead, so every position is tried and overlapping keywords are all
+  seen;
+* regex rules are combined into one pattern that cheaply rejects rows no
+  rule can match; the rest test the rules one by one in priority order;
+* amount-only rules are checked directly.
+
+A learned mapping wins over rules, so manual corrections stick. Among
+matching rules the lowest ``priority`` (then the lowest id) wins.
+"""
+
+import re
+import string
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional, Sequence
+
+# Digits and punctuation become spaces in learned keys (str.translate is far
+# cheaper than a regex substitution here)
+_SEPARATORS = str.maketrans(dict.fromkeys(string.digits + string.punctuation + "\t\r\v\f€§°„“”‚‘’–—…«»·", " "))
+
+
+def description_key(description: str) -> str:
+    """Normalized form of a description, the key of learned mappings."""
+    return " ".join(description.lower().translate(_SEPARATORS).split())[:200]
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: int
+    category_id: int
+    kind: str                   # "keyword", "regex" or "amount"
+    pattern: Optional[str] = None
+    amount_min: Optional[Decimal] = None
+    amount_max: Optional[Decimal] = None
+    type: Optional[str] = None  # "income" / "expense", None for both
+    priority: int = 100
+
+    def accepts(self, amount: Decimal, type: str) -> bool:
+        return (
+            (self.type is None or self.type == type)
+            and (self.amount_min is None or amount >= self.amount_min)
+            and (self.amount_max is None or amount <= self.amount_max)
+        )
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """One regex matching any of ``words``, factored by common prefixes."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        single_chars = all(len(b) == 1 or (len(b) == 2 and b[0] == "\\") for b in branches)
+        if len(branches) == 1:
+            body = branches[0]
+        elif single_chars:
+            body = "[" + "".join(branches) + "]"
+        else:
+            body = "(?:" + "|".join(branches) + ")"
+        if end:
+            # Greedy optional: prefer the longest keyword at a position
+            body = body + "?" if single_chars or len(branches) > 1 else "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+def _substrings(word: str) -> set[str]:
+    return {word[i:j] for i in range(len(word)) for j in range(i + 1, len(word) + 1)}
+
+
+class Categorizer:
+    def __init__(self, rules: Iterable[Rule], learned: Optional[dict[str, int]] = None) -> None:
+        self.learned = learned or {}
+        ordered = sorted(rules, key=lambda r: (r.priority, r.id))
+        self._rank = {rule.id: i for i, rule in enumerate(ordered)}
+        self._keywords: dict[str, list[Rule]] = {}
+        self._regexes: list[tuple[re.Pattern, Rule]] = []
+        self._amount_rules: list[Rule] = []
+        for rule in ordered:
+            if rule.kind == "keyword":
+                self._keywords.setdefault(rule.pattern.lower(), []).append(rule)
+            elif rule.kind == "regex":
+                self._regexes.append((re.compile(f"(?i:{rule.pattern})"), rule))
+            else:
+                self._amount_rules.append(rule)
+        # Zero-width, so a match does not consume the text of overlapping ones
+        self._keyword_pattern = re.compile(f"(?=({_trie_pattern(self._keywords)}))") if self._keywords else None
+        # The scan reports the longest keyword at a position; keywords inside
+        # it ("amazon" in "amazon prime") matched too, so inherit their rules
+        self._candidates = {
+            keyword: sorted(
+                {rule for inner in _substrings(keyword) if inner in self._keywords for rule in self._keywords[inner]},
+                key=lambda r: self._rank[r.id],
+            )
+            for keyword in self._keywords
+        }
+        self._regex_pattern = re.compile("|".join(
+            f"(?i:{rule.pattern})" for _, rule in self._regexes
+        )) if self._regexes else None
+
+    def categorize(self, description: str, amount: Decimal, type: str) -> Optional[int]:
+        """Category for one transaction (amount positive), or None."""
+        return self.categorize_many([(description, amount, type)])[0]
+
+    def categorize_many(self, rows: Sequence[tuple[str, Decimal, str]]) -> list[Optional[int]]:
+        """Categories for ``(description, amount, type, ...)`` rows, in order.
+
+        Descriptions are joined into one newline-separated text, so
+        lowercasing, learned-key normalization and the keyword scan each run
+        once per batch in C instead of once per row.
+        """
+        if not rows:
+            return []
+        text = "\n".join(row[0] for row in rows).lower()
+        lines = text.split("\n")
+        if len(lines) != len(rows):  # a description contains a newline
+            lines = [row[0].replace("\n", " ").lower() for row in rows]
+            text = "\n".join(lines)
+
+        result: list[Optional[int]] = [None] * len(rows)
+        if self.learned:
+            learned = self.learned
+            for i, line in enumerate(text.translate(_SEPARATORS).split("\n")):
+                result[i] = learned.get(" ".join(line.split())[:200])
+
+        rank = self._rank
+        best: list[Optional[Rule]] = [None] * len(rows)
+        if self._keyword_pattern is not None:
+            row, row_end = 0, len(lines[0])
+            for match in self._keyword_pattern.finditer(text):
+                while match.start() > row_end:
+                    row += 1
+                    row_end += len(lines[row]) + 1
+                if result[row] is not None:
+                    continue
+                amount, type = rows[row][1], rows[row][2]
+                for rule in self._candidates[match.group(1)]:  # in rank order
+                    if rule.accepts(amount, type):
+                        if best[row] is None or rank[rule.id] < rank[best[row].id]:
+                            best[row] = rule
+                        break
+
+        regexes, amount_rules = self._regex_pattern, self._amount_rules
+        if regexes is not None or amount_rules:
+            for i, row in enumerate(rows):
+                if result[i] is not None:
+                    continue
+                amount, type = row[1], row[2]
+                current = best[i]
+                if regexes is not None and regexes.search(lines[i]):
+                    for pattern, rule in self._regexes:  # in rank order
+                        if current is not None and rank[rule.id] > rank[current.id]:
+                            break
+                        if rule.accepts(amount, type) and pattern.search(lines[i]):
+                            current = rule
+                            break
+                for rule in amount_rules:  # in rank order
+                    if current is not None and rank[rule.id] > rank[current.id]:
+                        break
+                    if rule.accepts(amount, type):
+                        current = rule
+                        break
+                best[i] = current
+
+        for i, rule in enumerate(best):
+            if result[i] is None and rule is not None:
+                result[i] = rule.category_id
+        return result
@@ -0,0 +1,99 @@
+"""Cross-worker change notifications.
+
+Every write bumps ``users.data_version`` and, in the same statement, calls
+``pg_notify(CHANNEL, '<user_id>:<data_version>')``. Postgres delivers the
+notification to all listening connections when the transaction commits
+and drops it on rollback.
+
+Each worker process keeps one dedicated ``LISTEN`` connection (outside the
+pool) and fans notifications out to the queues of its open streams. A queue
+holds at most one pending wake-up: a burst of writes (an import commits
+once per batch) coalesces into a single refresh. After a reconnect every
+subscriber is woken, since notifications sent in between are lost.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import asyncpg
+
+CHANNEL = "ledger_changes"
+HEALTH_CHECK_SECONDS = 30
+RECONNECT_SECONDS = 2
+
+logger = logging.getLogger("ledger")
+
+
+class ChangeFeed:
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: int) -> None:
+        """Wake the streams of ``user_id`` in this process."""
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.empty():  # otherwise a refresh is pending already
+                queue.put_nowait(None)
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            user_id = int(payload.partition(":")[0])
+        except ValueError:
+            return
+        self.publish(user_id)
+
+    async def _listen(self) -> None:
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(CHANNEL, self._on_notification)
+            for user_id in list(self._subscribers):
+                self.publish(user_id)
+            while True:
+                try:
+                    await asyncio.wait_for(lost.wait(), HEALTH_CHECK_SECONDS)
+                    return
+                except asyncio.TimeoutError:
+                    # A half-open TCP connection never terminates by itself
+                    await connection.fetchval("SELECT 1", timeout=HEALTH_CHECK_SECONDS)
+        finally:
+            if not connection.is_closed():
+                connection.terminate()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("change feed connection failed")
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
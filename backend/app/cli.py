@@ -0,0 +1,66 @@
+"""Maintenance commands for LEDGER.
+
+Usage (from the backend directory or /app in the container)::
+
+    python -m app.cli rebuild-rollups [--user-id N] [--check]
+    python -m app.cli prune-idempotency-keys
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func
+
+from .main import IDEMPOTENCY_TTL_HOURS, IdempotencyKey, async_session_maker, engine, rebuild_rollups
+
+
+async def _rebuild_rollups(args: argparse.Namespace) -> int:
+    try:
+        async with async_session_maker() as db:
+            result = await rebuild_rollups(db, user_id=args.user_id, check_only=args.check)
+    finally:
+        await engine.dispose()
+
+    for key, actual, expected in result["mismatches"]:
+        print(f"  {key}: rollup={actual} transactions={expected}")
+    print(f"mismatched rollup rows before: {result['mismatched_before']}")
+    if args.check:
+        return 0 if result["mismatched_before"] == 0 else 1
+    print(f"mismatched rollup rows after:  {result['mismatched_after']}")
+    return 0 if result["mismatched_after"] == 0 else 1
+
+
+async def _prune_idempotency_keys(args: argparse.Namespace) -> int:
+    try:
+        async with async_session_maker() as db:
+            result = await db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.created_at < func.now() - timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+            ))
+            await db.commit()
+    finally:
+        await engine.dispose()
+    print(f"deleted {result.rowcount} expired idempotency keys")
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rollups = commands.add_parser("rebuild-rollups", help="recompute monthly rollups from transactions and verify them")
+    rollups.add_argument("--user-id", type=int, help="only rebuild this user")
+    rollups.add_argument("--check", action="store_true", help="only compare, do not rewrite")
+    rollups.set_defaults(handler=_rebuild_rollups)
+
+    prune = commands.add_parser("prune-idempotency-keys", help="delete idempotency keys older than LEDGER_IDEMPOTENCY_TTL_HOURS")
+    prune.set_defaults(handler=_prune_idempotency_keys)
+
+    args = parser.parse_args(argv)
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Cash-flow forecast.
+
+Projects a user's balance day by day from today up to 24 months ahead:
+
+* income: active ``Income`` rows; monthly income is credited on the 1st,
+  yearly income on the 1st of the month it was created in, weekly income
+  every 7 days on the weekday it was created on;
+* fixed costs: active fixed budget items, debited on the 1st of a month;
+* variable spending: per category, the average monthly expense of the last
+  complete months (from the rollups) beyond what fixed items already cover,
+  spread evenly over the days of a month. Without history the variable
+  budget items stand in.
+
+Everything is computed on integer-cent NumPy arrays, one slot per day.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+from .reports import month_ordinal, month_start
+
+HISTORY_MONTHS = 6
+
+
+@dataclass
+class ForecastInputs:
+    today: date
+    balance: int                              # cents
+    incomes: list[tuple[int, str, date]]      # (cents, frequency, created on)
+    budget: list[tuple[int, int, bool]]       # (category id, cents per month, is_fixed)
+    history: list[tuple[date, int, int]]      # (month, category id, expense cents), complete months only
+
+
+def _month_lengths(months: np.ndarray) -> np.ndarray:
+    """Number of days of each month in ``months`` (datetime64[M])."""
+    return ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+
+
+def monthly_income(incomes: list[tuple[int, str, date]]) -> int:
+    """Income normalized to cents per month."""
+    per_month = {"weekly": 52 / 12, "monthly": 1, "yearly": 1 / 12}
+    return round(sum(cents * per_month[frequency] for cents, frequency, _ in incomes))
+
+
+def _income_flows(days: np.ndarray, incomes: list[tuple[int, str, date]]) -> np.ndarray:
+    flows = np.zeros(len(days), np.int64)
+    month_starts = days == days.astype("datetime64[M]").astype("datetime64[D]")
+    month_of_year = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday; Monday = 0
+    for cents, frequency, created in incomes:
+        if frequency == "monthly":
+            flows[month_starts] += cents
+        elif frequency == "yearly":
+            flows[month_starts & (month_of_year == created.month)] += cents
+        else:
+            flows[weekday == created.weekday()] += cents
+    return flows
+
+
+def variable_spending(inputs: ForecastInputs) -> dict[int, int]:
+    """Expected variable spending per category, in cents per month."""
+    fixed: dict[int, int] = {}
+    planned: dict[int, int] = {}
+    for category_id, cents, is_fixed in inputs.budget:
+        target = fixed if is_fixed else planned
+        target[category_id] = target.get(category_id, 0) + cents
+    if not inputs.history:
+        return planned
+
+    months = np.array([month_ordinal(m) for m, _, _ in inputs.history])
+    category = np.array([c for _, c, _ in inputs.history])
+    cents = np.array([v for _, _, v in inputs.history], np.int64)
+    # Average over the months since the first one with data, not over the
+    # whole window, so a new account is not diluted by empty months
+    span = month_ordinal(inputs.today) - months.min()
+    ids, code = np.unique(category, return_inverse=True)
+    mean = np.bincount(code, weights=cents, minlength=len(ids)) / span
+    covered = np.array([fixed.get(int(c), 0) for c in ids])
+    estimate = np.maximum(np.round(mean - covered), 0).astype(np.int64)
+    return {int(c): int(v) for c, v in zip(ids, estimate) if v}
+
+
+def build_forecast(inputs: ForecastInputs, months: int) -> dict[str, Any]:
+    """Daily balance from today to the end of the ``months``-th month, the
+    current one counting as the first (``months`` monthly buckets).
+
+    Amounts in the result are euros. The current month's fixed items and
+    income are assumed to be booked already (unless today is the 1st).
+    """
+    start = np.datetime64(inputs.today, "D")
+    first_month = month_ordinal(inputs.today)
+    end = np.datetime64(month_start(first_month + months), "D")
+    days = np.arange(start, end)
+    month_index = days.astype("datetime64[M]").astype(np.int64) - days[0].astype("datetime64[M]").astype(np.int64)
+    n_months = int(month_index[-1]) + 1
+
+    income = _income_flows(days, inputs.incomes)
+
+    fixed_monthly = sum(cents for _, cents, is_fixed in inputs.budget if is_fixed)
+    month_starts = days == days.astype("datetime64[M]").astype("datetime64[D]")
+    fixed = np.where(month_starts, fixed_monthly, 0).astype(np.int64)
+
+    variable_monthly = sum(variable_spending(inputs).values())
+    lengths = _month_lengths(np.unique(days.astype("datetime64[M]")))
+    # Integer cents per day; the remainder goes to the first days of the month
+    day_of_month = (days - days.astype("datetime64[M]").astype("datetime64[D]")).astype(np.int64)
+    per_day, remainder = np.divmod(variable_monthly, lengths)
+    variable = per_day[month_index] + (day_of_month < remainder[month_index])
+
+    net = income - fixed - variable
+    balance = inputs.balance + np.cumsum(net)
+
+    end_of_month = np.r_[np.flatnonzero(np.diff(month_index)), len(days) - 1]
+    labels = np.unique(days.astype("datetime64[M]")).astype(str).tolist()
+    income_m, fixed_m, variable_m = (
+        (np.bincount(month_index, weights=flow, minlength=n_months) / 100).tolist() for flow in (income, fixed, variable)
+    )
+    end_balance = (balance[end_of_month] / 100).tolist()
+    lowest = int(np.argmin(balance))
+    return {
+        "start": inputs.today.isoformat(),
+        "start_balance": inputs.balance / 100,
+        "monthly_income": monthly_income(inputs.incomes) / 100,
+        "monthly_fixed": fixed_monthly / 100,
+        "monthly_variable": variable_monthly / 100,
+        "dates": days.astype(str).tolist(),
+        "balance": (balance / 100).tolist(),
+        "months": [
+            {
+                "month": labels[i],
+                "income": income_m[i],
+                "fixed": fixed_m[i],
+                "variable": variable_m[i],
+                "end_balance": end_balance[i],
+            }
+            for i in range(n_months)
+        ],
+        "lowest": {"date": str(days[lowest]), "balance": int(balance[lowest]) / 100},
+    }
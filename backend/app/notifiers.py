@@ -0,0 +1,105 @@
+"""Alert delivery.
+
+Budget alerts are written to the ``alert_outbox`` table in the same database
+transaction as the write that caused them; a background worker hands the
+pending rows to a ``Notifier``. Which one is chosen by
+``LEDGER_ALERT_NOTIFIER``:
+
+* ``telegram``: a message through the Bot API;
+* ``webhook``: the alert as JSON, POSTed to a URL;
+* ``file``: one JSON line per alert appended to a file (tests, local setups).
+
+``send`` raises on failure; the worker then retries with backoff.
+"""
+
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+from .serialization import dumps
+
+TIMEOUT = httpx.Timeout(10.0)
+
+
+def _euro(amount: Any) -> str:
+    return f"{Decimal(amount):,.2f}".replace(",", " ").replace(".", ",").replace(" ", ".") + " €"
+
+
+def format_alert(alert: dict[str, Any]) -> str:
+    """Human readable (German) text of an alert."""
+    if alert["kind"] == "budget_threshold":
+        return (
+            f"⚠️ Budget {alert['category']}: {alert['threshold']} % erreicht — "
+            f"{_euro(alert['spent'])} von {_euro(alert['budget'])} im {alert['month']}"
+        )
+    return f"LEDGER: {alert['kind']}"
+
+
+class Notifier:
+    async def send(self, alert: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class TelegramNotifier(Notifier):
+    def __init__(self, bot_token: str, chat_id: str) -> None:
+        self.url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.chat_id = chat_id
+        self.client = httpx.AsyncClient(timeout=TIMEOUT)
+
+    async def send(self, alert: dict[str, Any]) -> None:
+        response = await self.client.post(self.url, json={"chat_id": self.chat_id, "text": format_alert(alert)})
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class WebhookNotifier(Notifier):
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.client = httpx.AsyncClient(timeout=TIMEOUT)
+
+    async def send(self, alert: dict[str, Any]) -> None:
+        body = dumps({**alert, "text": format_alert(alert)})
+        response = await self.client.post(self.url, content=body, headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class FileNotifier(Notifier):
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+    def _append(self, line: bytes) -> None:
+        with self.path.open("ab") as f:
+            f.write(line + b"\n")
+
+    async def send(self, alert: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._append, dumps({**alert, "text": format_alert(alert)}))
+
+
+def create_notifier(
+    kind: str,
+    telegram_bot_token: Optional[str] = None,
+    telegram_chat_id: Optional[str] = None,
+    webhook_url: Optional[str] = None,
+    file_path: Optional[str] = None,
+) -> Optional[Notifier]:
+    """The configured notifier, or None if alerts are not delivered."""
+    if not kind:
+        return None
+    if kind == "telegram" and telegram_bot_token and telegram_chat_id:
+        return TelegramNotifier(telegram_bot_token, telegram_chat_id)
+    if kind == "webhook" and webhook_url:
+        return WebhookNotifier(webhook_url)
+    if kind == "file" and file_path:
+        return FileNotifier(file_path)
+    raise RuntimeError(f"Alert notifier {kind!r} is unknown or not fully configured")
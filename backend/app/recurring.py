@@ -0,0 +1,150 @@
+"""Recurring payment detection.
+
+Expenses are grouped by normalized description (``description_key``, so
+dates and reference numbers do not split a group), then split into runs of
+similar amounts. A run whose booking intervals cluster around a week, a
+month or a year is a recurring payment with the matching ``FrequencyEnum``
+value.
+
+``RecurringDetector`` keeps the groups of one user in memory and is fed
+only transactions above its id watermark, so after the first build a
+request re-evaluates just the groups that received new rows. Edits and
+deletions of older rows are not seen; the owner drops the detector then
+(and rebuilds it periodically, which also catches rows whose id committed
+out of order).
+"""
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from statistics import median
+from typing import Iterable, NamedTuple, Optional
+
+from .categorize import description_key
+
+CENT = Decimal("0.01")
+
+# frequency -> (nominal days, accepted interval range, minimum occurrences, months per period)
+PERIODS = {
+    "weekly": (7, (5, 9), 4, Decimal(12) / Decimal(52)),
+    "monthly": (30, (26, 35), 3, Decimal(1)),
+    "yearly": (365, (350, 380), 2, Decimal(12)),
+}
+REGULARITY = 0.7  # share of intervals that must fall into the range
+
+
+class Booking(NamedTuple):
+    id: int
+    day: date
+    amount: Decimal
+    category_id: Optional[int]
+    budget_item_id: Optional[int]
+    description: str
+
+
+@dataclass
+class RecurringSeries:
+    key: str
+    frequency: str
+    period_days: int
+    bookings: list[Booking]  # by date
+
+    @property
+    def last(self) -> Booking:
+        return self.bookings[-1]
+
+    @property
+    def amount(self) -> Decimal:
+        """Current price: the most recent booking."""
+        return self.last.amount
+
+    @property
+    def amount_monthly(self) -> Decimal:
+        return (self.amount / PERIODS[self.frequency][3]).quantize(CENT)
+
+    def next_expected(self) -> date:
+        if self.frequency == "monthly":
+            return _add_months(self.last.day, 1)
+        if self.frequency == "yearly":
+            return _add_months(self.last.day, 12)
+        return self.last.day + timedelta(days=7)
+
+    def active(self, today: date) -> bool:
+        """Not overdue by more than half a period."""
+        return today <= self.next_expected() + timedelta(days=self.period_days // 2)
+
+    def most_common(self, field: str):
+        counts: dict = {}
+        for booking in self.bookings:
+            value = getattr(booking, field)
+            if value is not None:
+                counts[value] = counts.get(value, 0) + 1
+        return max(counts, key=counts.get) if counts else None
+
+
+def _add_months(day: date, months: int) -> date:
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _amount_runs(bookings: list[Booking]) -> list[list[Booking]]:
+    """Split bookings into runs of similar amounts (within 10%, at least 1.00)."""
+    runs: list[list[Booking]] = []
+    for booking in sorted(bookings, key=lambda b: b.amount):
+        if runs and booking.amount - runs[-1][0].amount <= max(Decimal(1), runs[-1][0].amount / 10):
+            runs[-1].append(booking)
+        else:
+            runs.append([booking])
+    return runs
+
+
+def _classify(bookings: list[Booking]) -> Optional[tuple[str, int]]:
+    days = sorted({b.day for b in bookings})
+    if len(days) < 2:
+        return None
+    intervals = [(b - a).days for a, b in zip(days, days[1:])]
+    typical = median(intervals)
+    for frequency, (nominal, (low, high), minimum, _) in PERIODS.items():
+        if low <= typical <= high and len(days) >= minimum:
+            regular = sum(low <= i <= high for i in intervals)
+            if regular >= REGULARITY * len(intervals):
+                return frequency, nominal
+    return None
+
+
+def detect_group(key: str, bookings: list[Booking]) -> list[RecurringSeries]:
+    found = []
+    for run in _amount_runs(bookings):
+        classified = _classify(run)
+        if classified is not None:
+            run.sort(key=lambda b: (b.day, b.id))
+            found.append(RecurringSeries(key, classified[0], classified[1], run))
+    return found
+
+
+class RecurringDetector:
+    def __init__(self) -> None:
+        self.watermark = 0  # highest transaction id seen
+        self._groups: dict[str, list[Booking]] = {}
+        self._series: dict[str, list[RecurringSeries]] = {}
+        self._dirty: set[str] = set()
+
+    def add(self, bookings: Iterable[Booking]) -> None:
+        """Feed expense bookings; ids at or below the watermark are skipped."""
+        watermark = self.watermark
+        for booking in bookings:
+            if booking.id <= watermark:
+                continue
+            self.watermark = max(self.watermark, booking.id)
+            key = description_key(booking.description)
+            if key:
+                self._groups.setdefault(key, []).append(booking)
+                self._dirty.add(key)
+
+    def series(self) -> list[RecurringSeries]:
+        for key in self._dirty:
+            self._series[key] = detect_group(key, self._groups[key])
+        self._dirty.clear()
+        return [s for found in self._series.values() for s in found]
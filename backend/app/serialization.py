@@ -0,0 +1,53 @@
+"""Fast JSON path for list endpoints.
+
+FastAPI's default path turns every ORM row into a response model,
+re-validates it against ``response_model`` and runs the result through
+``jsonable_encoder`` before ``json.dumps``. For thousands of transactions
+that dominates the request. Endpoints using this module instead select
+exactly the response fields as plain columns and return a
+``FastJSONResponse``; FastAPI skips validation for ``Response`` objects, and
+``response_model`` on the route still documents the schema in OpenAPI.
+
+The JSON matches what Pydantic would produce: ``Decimal`` as string,
+``date``/``datetime`` as ISO 8601, enums by value.
+"""
+
+from decimal import Decimal
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class Projection:
+    """The columns of ``entity`` named like the fields of ``response_model``.
+
+    ``select(*projection.columns)`` fetches bare tuples instead of ORM
+    objects; ``projection.dicts(rows)`` turns them into response dicts.
+    """
+
+    def __init__(self, response_model: type[BaseModel], entity: Any) -> None:
+        self.fields = tuple(response_model.model_fields)
+        self.columns = [getattr(entity, name) for name in self.fields]
+
+    def dicts(self, rows: Iterable[tuple]) -> list[dict[str, Any]]:
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
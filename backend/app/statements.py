@@ -0,0 +1,352 @@
+"""Streaming parsers for bank statement imports (CSV, CAMT.053, MT940).
+
+Every parser is a generator over a binary file object that yields
+``RawStatementRow`` tuples as soon as a booking has been read, so an
+import never holds more than one batch of rows in memory.  Parsing is
+deliberately lax (strings are passed through untouched); turning the raw
+values into typed records happens batch-wise in ``validate_batch``.
+"""
+
+import codecs
+import csv
+import enum
+import io
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import IO, Any, Callable, Iterable, Iterator, NamedTuple, Optional
+
+
+class StatementFormat(enum.Enum):
+    csv = "csv"
+    camt053 = "camt053"
+    mt940 = "mt940"
+
+
+class RawStatementRow(NamedTuple):
+    line: int            # line (CSV/MT940) or entry number (CAMT) for error reporting
+    date: str
+    amount: str          # signed, as found in the file
+    description: str
+    type: Optional[str] = None  # explicit "income"/"expense" when the file has one
+
+
+@dataclass
+class BatchResult:
+    records: list[tuple[Any, ...]] = field(default_factory=list)
+    rejected: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)  # capped sample of rejections
+
+
+# Largest absolute value that fits into Numeric(10, 2)
+MAX_AMOUNT = Decimal("99999999.99")
+CENT = Decimal("0.01")
+# Postgres text columns reject NUL; other C0 controls are garbage in a
+# description. Line breaks and tabs (multi-line CSV fields) become spaces.
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0e-\x1f\x7f]")
+_BREAKS = str.maketrans(dict.fromkeys("\t\n\v\f\r", " "))
+
+
+# --- Format detection ---
+
+def detect_format(filename: Optional[str], head: bytes) -> StatementFormat:
+    name = (filename or "").lower()
+    if name.endswith(".xml") or b"camt.053" in head or b"<BkToCstmrStmt" in head:
+        return StatementFormat.camt053
+    if name.endswith((".sta", ".mt940", ".940")) or re.search(rb"^:20:", head, re.M):
+        return StatementFormat.mt940
+    return StatementFormat.csv
+
+
+def parse_statement(stream: IO[bytes], fmt: StatementFormat, encoding: str = "utf-8-sig") -> Iterator[RawStatementRow]:
+    if fmt is StatementFormat.camt053:
+        return parse_camt053(stream)
+    if fmt is StatementFormat.mt940:
+        return parse_mt940(stream, encoding)
+    return parse_csv(stream, encoding)
+
+
+# --- CSV ---
+
+_CSV_COLUMNS = {
+    "date": ("date", "datum", "buchungstag", "buchungsdatum", "valutadatum", "wertstellung"),
+    "amount": ("amount", "betrag", "betrag (eur)", "betrag (€)", "umsatz"),
+    "description": ("description", "verwendungszweck", "beschreibung", "buchungstext", "text"),
+    "payee": ("payee", "empfänger", "beguenstigter/zahlungspflichtiger", "begünstigter/zahlungspflichtiger",
+              "auftraggeber / begünstigter", "name zahlungsbeteiligter", "zahlungsempfänger*in"),
+    "type": ("type", "typ", "soll/haben"),
+}
+# Banks like to put a few lines of account metadata above the real header
+_CSV_HEADER_SEARCH_LINES = 30
+
+
+def _csv_header_map(header: list[str]) -> Optional[dict[str, int]]:
+    normalized = [h.strip().strip('"').lower() for h in header]
+    mapping: dict[str, int] = {}
+    for key, aliases in _CSV_COLUMNS.items():
+        # Aliases are listed by preference, e.g. Buchungstag wins over Wertstellung
+        index = next((normalized.index(a) for a in aliases if a in normalized), None)
+        if index is not None:
+            mapping[key] = index
+    if "date" in mapping and "amount" in mapping:
+        return mapping
+    return None
+
+
+def parse_csv(stream: IO[bytes], encoding: str = "utf-8-sig") -> Iterator[RawStatementRow]:
+    text = io.TextIOWrapper(stream, encoding=encoding, errors="replace", newline="")
+    head = text.readline()
+    try:
+        dialect: Any = csv.Sniffer().sniff(head, delimiters=";,\t|")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(_prepend(head, text), dialect)
+
+    mapping = None
+    for row in islice(reader, _CSV_HEADER_SEARCH_LINES):
+        mapping = _csv_header_map(row)
+        if mapping:
+            break
+    if mapping is None:
+        raise ValueError("CSV header with date and amount columns not found")
+
+    i_date, i_amount = mapping["date"], mapping["amount"]
+    i_desc, i_payee, i_type = mapping.get("description"), mapping.get("payee"), mapping.get("type")
+    width = max(mapping.values()) + 1
+    for row in reader:
+        if len(row) < width:
+            if any(row):
+                yield RawStatementRow(reader.line_num, "", "", "", None)  # rejected by validation
+            continue
+        description = row[i_desc].strip() if i_desc is not None else ""
+        if i_payee is not None and row[i_payee].strip():
+            description = f"{row[i_payee].strip()} {description}".strip()
+        kind = row[i_type].strip() if i_type is not None else None
+        amount = row[i_amount].strip()
+        if kind in ("S", "H"):
+            # Soll/Haben column: unsigned amount, S = debit
+            amount = ("-" if kind == "S" else "") + amount.lstrip("+-")
+            kind = None
+        yield RawStatementRow(reader.line_num, row[i_date].strip(), amount, description, kind)
+
+
+def _prepend(first: str, rest: Iterable[str]) -> Iterator[str]:
+    yield first
+    yield from rest
+
+
+# --- CAMT.053 (ISO 20022 XML) ---
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _find(elem: ET.Element, path: str) -> Optional[ET.Element]:
+    node: Optional[ET.Element] = elem
+    for part in path.split("/"):
+        if node is None:
+            return None
+        node = next((c for c in node if _local(c.tag) == part), None)
+    return node
+
+
+def _text(elem: ET.Element, path: str) -> str:
+    node = _find(elem, path)
+    return (node.text or "").strip() if node is not None else ""
+
+
+def parse_camt053(stream: IO[bytes]) -> Iterator[RawStatementRow]:
+    parent: Optional[ET.Element] = None
+    entry_no = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            if tag == "Stmt":
+                parent = elem
+            continue
+        if tag != "Ntry":
+            continue
+
+        entry_no += 1
+        amount = _text(elem, "Amt")
+        if _text(elem, "CdtDbtInd") == "DBIT":
+            amount = "-" + amount
+        booked = _text(elem, "BookgDt/Dt") or _text(elem, "BookgDt/DtTm")[:10] or _text(elem, "ValDt/Dt")
+
+        details = _find(elem, "NtryDtls/TxDtls")
+        parts: list[str] = []
+        if details is not None:
+            party = _text(details, "RltdPties/Cdtr/Nm") if amount.startswith("-") else _text(details, "RltdPties/Dbtr/Nm")
+            if party:
+                parts.append(party)
+            remittance = _find(details, "RmtInf")
+            if remittance is not None:
+                parts.extend((c.text or "").strip() for c in remittance if _local(c.tag) == "Ustrd")
+        if not parts:
+            parts.append(_text(elem, "AddtlNtryInf"))
+        yield RawStatementRow(entry_no, booked, amount, " ".join(p for p in parts if p))
+
+        # Drop the processed entry so memory stays flat on multi-year statements
+        if parent is not None:
+            parent.remove(elem)
+        else:
+            elem.clear()
+
+
+# --- MT940 (SWIFT) ---
+
+_MT940_TAG = re.compile(r"^:(\d{2}[A-Z]?):(.*)$")
+_MT940_61 = re.compile(r"^(\d{6})(\d{4})?(R?[CD])[A-Z]?(\d+(?:,\d{0,2})?)")
+_MT940_86_FIELD = re.compile(r"\?(\d{2})")
+
+
+def _mt940_description(info: str) -> str:
+    if "?" not in info:
+        return info.strip()
+    # German structured :86: — ?20-?29 and ?60-?63 purpose, ?32/?33 counterparty
+    fields: dict[int, str] = {}
+    pieces = _MT940_86_FIELD.split(info)
+    for code, value in zip(pieces[1::2], pieces[2::2]):
+        fields[int(code)] = fields.get(int(code), "") + value
+    purpose = "".join(fields.get(i, "") for i in (*range(20, 30), *range(60, 64)))
+    party = " ".join(fields[i].strip() for i in (32, 33) if fields.get(i, "").strip())
+    return " ".join(p.strip() for p in (party, purpose) if p.strip()) or info.strip()
+
+
+def _mt940_row(line: int, statement: str, info: str) -> RawStatementRow:
+    match = _MT940_61.match(statement)
+    if not match:
+        return RawStatementRow(line, "", "", info.strip())
+    value_date, _entry_date, mark, amount = match.groups()
+    year = int(value_date[:2])
+    iso = f"{1900 + year if year > 79 else 2000 + year}-{value_date[2:4]}-{value_date[4:6]}"
+    sign = "-" if mark in ("D", "RC") else ""
+    return RawStatementRow(line, iso, sign + amount, _mt940_description(info))
+
+
+def parse_mt940(stream: IO[bytes], encoding: str = "latin-1") -> Iterator[RawStatementRow]:
+    if codecs.lookup(encoding).name == "utf-8-sig":
+        # MT940 exports from German banks are ISO-8859-1 unless told otherwise
+        encoding = "latin-1"
+    text = io.TextIOWrapper(stream, encoding=encoding, errors="replace")
+    pending: Optional[list[Any]] = None  # [line, :61: content, :86: content]
+    current: Optional[str] = None
+    for line_no, raw in enumerate(text, 1):
+        line = raw.rstrip("\r\n")
+        match = _MT940_TAG.match(line)
+        if match:
+            current, content = match.groups()
+            if current == "61":
+                if pending:
+                    yield _mt940_row(*pending)
+                pending = [line_no, content, ""]
+            elif current == "86" and pending:
+                pending[2] = content
+            elif pending:
+                yield _mt940_row(*pending)
+                pending = None
+        elif line.strip() in ("", "-", "-}"):
+            current = None
+        elif pending and current == "86":
+            pending[2] += line
+        elif pending and current == "61":
+            pending[1] += line
+    if pending:
+        yield _mt940_row(*pending)
+
+
+# --- Batching & validation ---
+
+def batched(rows: Iterable[RawStatementRow], size: int) -> Iterator[list[RawStatementRow]]:
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+_DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d.%m.%y", "%d/%m/%Y", "%Y%m%d")
+
+
+def _parse_date(value: str) -> date:
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"invalid date {value!r}")
+
+
+def _parse_amount(value: str) -> Decimal:
+    value = value.replace(" ", "").replace("€", "").replace("EUR", "")
+    if "," in value and ("." not in value or value.rfind(",") > value.rfind(".")):
+        # German notation: 1.234,56
+        value = value.replace(".", "").replace(",", ".")
+    else:
+        value = value.replace(",", "")
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"invalid amount {value!r}") from None
+
+
+class BatchValidator:
+    """Turns raw rows into COPY-ready transaction records.
+
+    Record layout follows ``COPY_COLUMNS``.  Dates repeat heavily in bank
+    exports, so parsed dates are memoized for the lifetime of one import.
+    ``categorize`` maps a batch of ``(description, amount, type)`` to
+    category ids (see ``Categorizer.categorize_many``); ``category_id`` is
+    used where it returns None.
+    """
+
+    COPY_COLUMNS = ("user_id", "budget_item_id", "category_id", "amount", "date",
+                    "description", "type", "created_at")
+
+    def __init__(
+        self,
+        user_id: int,
+        category_id: Optional[int],
+        max_errors: int = 100,
+        categorize: Optional[Callable[[list[tuple[str, Decimal, str]]], list[Optional[int]]]] = None,
+    ) -> None:
+        self.user_id = user_id
+        self.category_id = category_id
+        self.categorize = categorize
+        self.max_errors = max_errors
+        self._reported = 0
+        self._dates: dict[str, date] = {}
+
+    def validate_batch(self, batch: list[RawStatementRow]) -> BatchResult:
+        result = BatchResult()
+        dates = self._dates
+        valid = []
+        created_at = datetime.now()
+        for row in batch:
+            try:
+                booked = dates.get(row.date)
+                if booked is None:
+                    booked = dates[row.date] = _parse_date(row.date)
+                amount = _parse_amount(row.amount).quantize(CENT)
+                if not amount or abs(amount) > MAX_AMOUNT:
+                    raise ValueError(f"zero or out-of-range amount {row.amount!r}")
+                if control := _CONTROL_CHARS.search(row.description):
+                    raise ValueError(f"control character {control.group()!r} in description")
+            except (ValueError, ArithmeticError) as e:
+                result.rejected += 1
+                if self._reported < self.max_errors:
+                    self._reported += 1
+                    result.errors.append({"line": row.line, "error": str(e)})
+                continue
+            kind = row.type if row.type in ("income", "expense") else ("income" if amount > 0 else "expense")
+            valid.append((row.description.translate(_BREAKS), abs(amount), kind, booked))
+
+        user_id, fallback = self.user_id, self.category_id
+        categories = self.categorize(valid) if self.categorize and valid else [None] * len(valid)
+        result.records = [
+            (user_id, None, fallback if category_id is None else category_id, amount, booked,
+             description, kind, created_at)
+            for (description, amount, kind, booked), category_id in zip(valid, categories)
+        ]
+        return result
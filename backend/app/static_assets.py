@@ -0,0 +1,142 @@
+"""In-memory index of the built frontend.
+
+The Vite output in ``/app/static`` is read once at startup: every file is
+kept in memory together with gzip and (if the ``brotli`` package is
+installed) brotli variants and a strong ETag per variant. Requests are then
+answered from the index without touching the filesystem.
+
+Hashed bundle names (``assets/index-3f2a1b4c.js``) never change content, so
+they are cached as ``immutable`` for a year; everything else, notably
+``index.html``, is revalidated with ``If-None-Match`` on every load.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Vite's default output names: assets/[name]-[hash].[ext]
+HASHED_ASSET = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Already compressed formats gain nothing; tiny files are not worth a variant
+COMPRESSIBLE = re.compile(r"^(text/|application/(javascript|json|xml|manifest\+json)|image/svg\+xml)")
+MIN_COMPRESS_SIZE = 1024
+
+
+@dataclass
+class Asset:
+    media_type: str
+    cache_control: str
+    # content-encoding ("identity", "br", "gzip") -> (body, etag)
+    variants: dict[str, tuple[bytes, str]] = field(default_factory=dict)
+
+    def pick(self, accept_encoding: str) -> str:
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return "identity"
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag``.
+
+    Weak comparison (RFC 9110 13.1.2): proxies may have added ``W/``.
+    """
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _load(path: Path, relative: str) -> Asset:
+    body = path.read_bytes()
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    asset = Asset(media_type, IMMUTABLE if HASHED_ASSET.match(relative) else REVALIDATE)
+    asset.variants["identity"] = (body, f'"{digest}"')
+
+    if len(body) < MIN_COMPRESS_SIZE or not COMPRESSIBLE.match(media_type):
+        return asset
+    # Prefer variants produced by the build (vite-plugin-compression & co)
+    prebuilt_br, prebuilt_gz = path.with_name(path.name + ".br"), path.with_name(path.name + ".gz")
+    if prebuilt_br.is_file():
+        br = prebuilt_br.read_bytes()
+    else:
+        br = brotli.compress(body, quality=11) if brotli is not None else None
+    gz = prebuilt_gz.read_bytes() if prebuilt_gz.is_file() else gzip.compress(body, compresslevel=9, mtime=0)
+    if br is not None and len(br) < len(body):
+        asset.variants["br"] = (br, f'"{digest}-br"')
+    if len(gz) < len(body):
+        asset.variants["gzip"] = (gz, f'"{digest}-gz"')
+    return asset
+
+
+class AssetIndex:
+    def __init__(self, assets: dict[str, Asset]) -> None:
+        self.assets = assets
+
+    @classmethod
+    def build(cls, root: str) -> "AssetIndex":
+        base = Path(root)
+        assets = {}
+        if base.is_dir():
+            for path in sorted(base.rglob("*")):
+                if not path.is_file() or path.suffix in (".br", ".gz"):
+                    continue
+                relative = path.relative_to(base).as_posix()
+                assets[relative] = _load(path, relative)
+        return cls(assets)
+
+    def resolve(self, path: str) -> Optional[Asset]:
+        """The asset for ``path``; unknown routes fall back to the SPA shell.
+
+        Missing files under ``assets/`` are a 404 rather than ``index.html``,
+        otherwise a stale chunk reference would be parsed as HTML.
+        """
+        path = path.lstrip("/")
+        asset = self.assets.get(path or "index.html")
+        if asset is None and not path.startswith("assets/"):
+            asset = self.assets.get("index.html")
+        return asset
+
+    def response(self, request: Request, path: str) -> Response:
+        asset = self.resolve(path)
+        if asset is None:
+            return Response(status_code=404)
+
+        encoding = asset.pick(request.headers.get("accept-encoding", ""))
+        body, etag = asset.variants[encoding]
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+        if len(asset.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type=asset.media_type, headers=headers)
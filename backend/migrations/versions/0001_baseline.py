@@ -0,0 +1,135 @@
+"""Baseline schema
+
+Everything the app used to create with ``Base.metadata.create_all`` on
+startup. Databases created that way already have these tables; each one is
+only created when missing, so ``alembic upgrade head`` adopts them as-is.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+frequency = postgresql.ENUM("monthly", "yearly", "weekly", name="frequencyenum", create_type=False)
+transaction_type = postgresql.ENUM("expense", "income", name="transactiontypeenum", create_type=False)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    offline = context.is_offline_mode()  # `alembic upgrade --sql`: emit the full schema
+    frequency.create(bind, checkfirst=not offline)
+    transaction_type.create(bind, checkfirst=not offline)
+    existing = set() if offline else set(sa.inspect(bind).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("external_id", sa.String()),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_external_id", "users", ["external_id"], unique=True)
+
+    if "income" not in existing:
+        op.create_table(
+            "income",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("amount", sa.Numeric(10, 2), nullable=False),
+            sa.Column("frequency", frequency, nullable=False),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_income_id", "income", ["id"])
+
+    if "categories" not in existing:
+        op.create_table(
+            "categories",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("icon", sa.String()),
+            sa.Column("color", sa.String()),
+            sa.Column("sort_order", sa.Integer()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_categories_id", "categories", ["id"])
+
+    if "budget_items" not in existing:
+        op.create_table(
+            "budget_items",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("amount_monthly", sa.Numeric(10, 2), nullable=False),
+            sa.Column("is_fixed", sa.Boolean()),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("notes", sa.String()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_budget_items_id", "budget_items", ["id"])
+
+    if "transactions" not in existing:
+        op.create_table(
+            "transactions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("budget_item_id", sa.Integer(), sa.ForeignKey("budget_items.id"), nullable=True),
+            sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+            sa.Column("amount", sa.Numeric(10, 2), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("description", sa.String(), nullable=False),
+            sa.Column("type", transaction_type, nullable=False),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_transactions_id", "transactions", ["id"])
+
+    if "monthly_snapshots" not in existing:
+        op.create_table(
+            "monthly_snapshots",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("month", sa.Date(), nullable=False),
+            sa.Column("total_income", sa.Numeric(10, 2), nullable=False),
+            sa.Column("total_expenses", sa.Numeric(10, 2), nullable=False),
+            sa.Column("total_savings", sa.Numeric(10, 2), nullable=False),
+            sa.Column("data_json", sa.JSON()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_monthly_snapshots_id", "monthly_snapshots", ["id"])
+
+    if "monthly_category_totals" not in existing:
+        op.create_table(
+            "monthly_category_totals",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("month", sa.Date(), primary_key=True),
+            sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), primary_key=True),
+            sa.Column("type", transaction_type, primary_key=True),
+            sa.Column("total", sa.Numeric(14, 2), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in (
+        "monthly_category_totals", "monthly_snapshots", "transactions",
+        "budget_items", "categories", "income", "users",
+    ):
+        op.drop_table(table)
+    transaction_type.drop(op.get_bind(), checkfirst=True)
+    frequency.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""Indexes for the per-user hot queries
+
+Until now only primary keys and ``users.external_id`` were indexed, so every
+per-user list, dashboard and report query scanned whole tables.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (user_id, date DESC, id DESC) serves keyset pagination as well as plain
+    # user_id + date range scans. IF NOT EXISTS: create_all may have built it.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_user_date_id "
+        "ON transactions (user_id, date DESC, id DESC)"
+    )
+    op.create_index("ix_categories_user_id", "categories", ["user_id"])
+    op.create_index("ix_budget_items_user_id", "budget_items", ["user_id"])
+    op.create_index("ix_income_user_id", "income", ["user_id"])
+    # Keep the newest snapshot per month before enforcing uniqueness
+    op.execute(
+        "DELETE FROM monthly_snapshots a USING monthly_snapshots b "
+        "WHERE a.user_id = b.user_id AND a.month = b.month AND a.id < b.id"
+    )
+    op.create_unique_constraint("uq_monthly_snapshots_user_month", "monthly_snapshots", ["user_id", "month"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_monthly_snapshots_user_month", "monthly_snapshots", type_="unique")
+    op.drop_index("ix_income_user_id", "income")
+    op.drop_index("ix_budget_items_user_id", "budget_items")
+    op.drop_index("ix_categories_user_id", "categories")
+    op.drop_index("ix_transactions_user_date_id", "transactions")
@@ -0,0 +1,40 @@
+"""Full-text and trigram search over transaction descriptions
+
+Adds a stored ``tsvector`` column and two GIN indexes, each led by
+``user_id`` (btree_gin) so a search only touches the caller's rows.
+Adding the generated column rewrites ``transactions`` once.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    op.add_column(
+        "transactions",
+        sa.Column("search_vector", postgresql.TSVECTOR(),
+                  sa.Computed("to_tsvector('simple', description)", persisted=True)),
+    )
+    op.create_index("ix_transactions_user_search", "transactions", ["user_id", "search_vector"], postgresql_using="gin")
+    op.create_index(
+        "ix_transactions_user_description_trgm", "transactions", ["user_id", "description"],
+        postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_user_description_trgm", "transactions")
+    op.drop_index("ix_transactions_user_search", "transactions")
+    op.drop_column("transactions", "search_vector")
@@ -0,0 +1,50 @@
+"""Categorization rules and learned category mappings
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+rule_kind = postgresql.ENUM("keyword", "regex", "amount", name="rulekindenum", create_type=False)
+transaction_type = postgresql.ENUM("expense", "income", name="transactiontypeenum", create_type=False)
+
+
+def upgrade() -> None:
+    rule_kind.create(op.get_bind(), checkfirst=True)
+    op.create_table(
+        "categorization_rules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=False),
+        sa.Column("kind", rule_kind, nullable=False),
+        sa.Column("pattern", sa.String()),
+        sa.Column("amount_min", sa.Numeric(10, 2)),
+        sa.Column("amount_max", sa.Numeric(10, 2)),
+        sa.Column("type", transaction_type),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_categorization_rules_id", "categorization_rules", ["id"])
+    op.create_index("ix_categorization_rules_user_id", "categorization_rules", ["user_id"])
+    op.create_table(
+        "category_mappings",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("key", sa.String(200), primary_key=True),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=False),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("category_mappings")
+    op.drop_table("categorization_rules")
+    rule_kind.drop(op.get_bind(), checkfirst=True)
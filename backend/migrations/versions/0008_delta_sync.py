@@ -0,0 +1,40 @@
+"""Change sequence and tombstones for delta sync
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ("income", "categories", "budget_items", "transactions")
+
+
+def upgrade() -> None:
+    # Existing rows get change_seq 0 and are picked up by the initial sync
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0"))
+        op.create_index(f"ix_{table}_user_change", table, ["user_id", "change_seq", "id"])
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("entity", sa.String(20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_sync_tombstones_user_change", "sync_tombstones", ["user_id", "change_seq", "id"])
+
+
+def downgrade() -> None:
+    op.drop_table("sync_tombstones")
+    for table in SYNCED_TABLES:
+        op.drop_index(f"ix_{table}_user_change", table)
+        op.drop_column(table, "change_seq")
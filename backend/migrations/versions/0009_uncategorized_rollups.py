@@ -0,0 +1,33 @@
+"""Roll up uncategorized transactions under category 0
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 0 is not a category row, so the rollup key can no longer reference categories
+    op.drop_constraint("monthly_category_totals_category_id_fkey", "monthly_category_totals", type_="foreignkey")
+    op.execute("""
+        INSERT INTO monthly_category_totals (user_id, month, category_id, type, total, count)
+        SELECT user_id, date_trunc('month', date)::date, 0, type, sum(amount), count(*)
+        FROM transactions
+        WHERE category_id IS NULL
+        GROUP BY user_id, date_trunc('month', date)::date, type
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM monthly_category_totals WHERE category_id = 0")
+    op.create_foreign_key(
+        "monthly_category_totals_category_id_fkey", "monthly_category_totals", "categories",
+        ["category_id"], ["id"],
+    )
@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+from app.categorize import Categorizer, Rule
+
+
+def test_overlapping_keywords_lowest_priority_wins():
+    categorizer = Categorizer([
+        Rule(1, 10, "keyword", "rewe", priority=200),
+        Rule(2, 20, "keyword", "we markt", priority=1),
+    ])
+    assert categorizer.categorize("REWE Markt 1234", Decimal("5"), "expense") == 20
+    assert categorizer.categorize("Rewe City", Decimal("5"), "expense") == 10
+
+
+def test_overlapping_regexes_lowest_priority_wins():
+    categorizer = Categorizer([
+        Rule(1, 10, "regex", "amazon pr", priority=200),
+        Rule(2, 20, "regex", "prime", priority=1),
+    ])
+    assert categorizer.categorize("Amazon Prime", Decimal("9"), "expense") == 20
+    assert categorizer.categorize("Amazon Pro", Decimal("9"), "expense") == 10
+
+
+def test_categorize_many_keeps_rows_apart():
+    categorizer = Categorizer([
+        Rule(1, 10, "keyword", "rewe", priority=200),
+        Rule(2, 20, "keyword", "we markt", priority=1),
+        Rule(3, 30, "regex", r"gehalt|lohn", type="income"),
+        Rule(4, 40, "amount", amount_min=Decimal("1000"), type="expense", priority=300),
+    ], learned={"kiosk": 50})
+    rows = [
+        ("rewe", Decimal("5"), "expense"),
+        ("rewe markt", Decimal("5"), "expense"),
+        ("Gehalt 10/2026", Decimal("3000"), "income"),
+        ("Gehalt 10/2026", Decimal("3000"), "expense"),
+        ("Kiosk 12", Decimal("2"), "expense"),
+        ("unknown", Decimal("1"), "expense"),
+    ]
+    assert categorizer.categorize_many(rows) == [10, 20, 30, 40, 50, None]
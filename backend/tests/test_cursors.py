@@ -0,0 +1,36 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.main import (
+    _decode_cursor, _decode_search_cursor, _decode_sync_cursor,
+    _encode_cursor, _encode_search_cursor, _encode_sync_cursor,
+)
+
+
+def test_transaction_cursor_round_trip():
+    cursor = _encode_cursor(date(2026, 10, 17), 123456)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == (date(2026, 10, 17), 123456)
+
+
+def test_search_cursor_keeps_the_exact_score():
+    score = 0.1 + 0.2
+    assert _decode_search_cursor(_encode_search_cursor(score, 9)) == (score, 9)
+
+
+def test_sync_cursor_round_trip():
+    assert _decode_sync_cursor(_encode_sync_cursor(41, 3, 7)) == (41, 3, 7)
+
+
+@pytest.mark.parametrize("decode, cursor", [
+    (_decode_cursor, "not-a-cursor"),
+    (_decode_cursor, _encode_search_cursor(1.5, 2)),
+    (_decode_search_cursor, "%%%"),
+    (_decode_sync_cursor, _encode_cursor(date(2026, 1, 1), 1)),
+])
+def test_invalid_cursors_are_a_400(decode, cursor):
+    with pytest.raises(HTTPException) as error:
+        decode(cursor)
+    assert error.value.status_code == 400
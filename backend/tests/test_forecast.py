@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+
+from app.forecast import ForecastInputs, build_forecast, monthly_income, variable_spending
+
+
+def inputs(today=date(2026, 10, 17), balance=100_000, incomes=(), budget=(), history=()):
+    return ForecastInputs(today, balance, list(incomes), list(budget), list(history))
+
+
+@pytest.mark.parametrize("today", [date(2026, 10, 1), date(2026, 10, 17), date(2026, 10, 31), date(2026, 12, 31)])
+@pytest.mark.parametrize("months", [1, 12, 24])
+def test_months_is_the_number_of_buckets(today, months):
+    result = build_forecast(inputs(today=today), months)
+    assert len(result["months"]) == months
+    assert result["months"][0]["month"] == today.strftime("%Y-%m")
+    assert result["dates"][0] == today.isoformat()
+    assert len(result["dates"]) == len(result["balance"])
+
+
+def test_last_day_is_the_end_of_the_last_month():
+    result = build_forecast(inputs(today=date(2026, 10, 17)), 3)
+    assert result["dates"][-1] == "2026-12-31"
+    assert [m["month"] for m in result["months"]] == ["2026-10", "2026-11", "2026-12"]
+
+
+def test_monthly_income_and_fixed_costs_land_on_the_first():
+    result = build_forecast(inputs(incomes=[(300_000, "monthly", date(2025, 1, 1))], budget=[(1, 100_000, True)]), 3)
+    months = result["months"]
+    # Already booked this month
+    assert (months[0]["income"], months[0]["fixed"]) == (0, 0)
+    assert (months[1]["income"], months[1]["fixed"]) == (3000, 1000)
+    assert months[2]["end_balance"] == 1000 + 2 * 2000
+    assert result["balance"][result["dates"].index("2026-11-01")] == 3000
+
+
+def test_variable_spending_is_spread_over_the_days():
+    result = build_forecast(inputs(balance=0, budget=[(1, 31_00, False)]), 2)
+    november = result["months"][1]
+    assert november["variable"] == 31  # cents divide unevenly over 30 days, nothing is lost
+    assert result["lowest"] == {"date": result["dates"][-1], "balance": result["balance"][-1]}
+
+
+def test_weekly_and_yearly_income():
+    assert monthly_income([(1200, "yearly", date(2025, 3, 1)), (1200, "weekly", date(2025, 1, 6))]) == 100 + 5200
+    result = build_forecast(inputs(balance=0, incomes=[(1000, "yearly", date(2020, 11, 15))]), 12)
+    assert [m["income"] for m in result["months"]][:3] == [0, 10, 0]
+
+
+def test_variable_spending_from_history_beyond_fixed_items():
+    history = [(date(2026, 8, 1), 1, 50_000), (date(2026, 9, 1), 1, 70_000), (date(2026, 9, 1), 2, 10_000)]
+    spending = variable_spending(inputs(budget=[(1, 40_000, True), (2, 99_900, False)], history=history))
+    # Averaged over the two months since the first with data; planned items are ignored
+    assert spending == {1: 20_000, 2: 5_000}
+
+
+def test_variable_spending_without_history_uses_the_budget():
+    assert variable_spending(inputs(budget=[(1, 40_000, True), (2, 12_300, False)])) == {2: 12_300}
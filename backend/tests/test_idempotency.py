@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.main import BudgetItemCreate, _idempotent_write, _unique_ids
+
+
+class KeyStore:
+    """Session double holding idempotency keys like the ``idempotency_keys`` table."""
+
+    def __init__(self, concurrent=None):
+        self.keys = {}
+        self.pending = None
+        self.commits = self.rollbacks = 0
+        self.concurrent = concurrent  # row another attempt commits first
+
+    async def scalar(self, statement):
+        return self.keys.get("k")
+
+    async def execute(self, statement):
+        params = statement.compile().params
+        if self.concurrent is not None:
+            self.keys["k"] = self.concurrent
+            return SimpleNamespace(first=lambda: None)
+        self.pending = SimpleNamespace(request_hash=params["request_hash"], response=params["response"])
+        return SimpleNamespace(first=lambda: ("k",))
+
+    async def commit(self):
+        self.commits += 1
+        if self.pending is not None:
+            self.keys["k"], self.pending = self.pending, None
+
+    async def rollback(self):
+        self.rollbacks += 1
+        self.pending = None
+
+
+def run(db, payload, key="k"):
+    calls = []
+
+    async def write():
+        calls.append(payload)
+        return {"created": [payload.name]}
+
+    response = asyncio.run(_idempotent_write(db, 1, key, "budget/batch", payload, write))
+    return response, calls
+
+
+ITEM = BudgetItemCreate(category_id=1, name="Miete", amount_monthly=900)
+
+
+def test_without_key_every_request_writes():
+    db = KeyStore()
+    for _ in range(2):
+        response, calls = run(db, ITEM, key=None)
+        assert calls and response.body == b'{"created":["Miete"]}'
+    assert db.commits == 2 and db.keys == {}
+
+
+def test_retry_replays_the_stored_response():
+    db = KeyStore()
+    first, calls = run(db, ITEM)
+    assert calls and db.commits == 1
+    again, calls = run(db, ITEM)
+    assert calls == []
+    assert again.body == first.body
+    assert again.headers["Idempotent-Replayed"] == "true"
+
+
+def test_key_reused_for_another_request_is_a_422():
+    db = KeyStore()
+    run(db, ITEM)
+    with pytest.raises(HTTPException) as error:
+        run(db, ITEM.model_copy(update={"name": "Strom"}))
+    assert error.value.status_code == 422
+
+
+def test_concurrent_attempt_that_lost_returns_the_winner():
+    winner = SimpleNamespace(request_hash=None, response='{"created":["first"]}')
+    db = KeyStore(concurrent=winner)
+    # Same request as the winner: compute its hash through a first store
+    reference = KeyStore()
+    run(reference, ITEM)
+    winner.request_hash = reference.keys["k"].request_hash
+
+    response, calls = run(db, ITEM)
+    assert calls  # our write ran ...
+    assert db.rollbacks == 1 and db.commits == 0  # ... and was rolled back
+    assert response.body == b'{"created":["first"]}'
+
+
+def test_duplicate_ids_in_an_update_list():
+    items = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+    assert _unique_ids(items) == [1, 2]
+    with pytest.raises(HTTPException) as error:
+        _unique_ids(items + [SimpleNamespace(id=1)])
+    assert error.value.status_code == 422
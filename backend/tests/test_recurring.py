@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.recurring import Booking, RecurringDetector, _add_months
+
+
+def monthly(first_id, description, amount, start=date(2026, 1, 31), count=6, category_id=None):
+    return [
+        Booking(first_id + i, _add_months(start, i), Decimal(amount), category_id, None, f"{description} {i:04d}")
+        for i in range(count)
+    ]
+
+
+def test_add_months_clamps_to_the_month_end():
+    assert _add_months(date(2026, 1, 31), 1) == date(2026, 2, 28)
+    assert _add_months(date(2026, 11, 30), 3) == date(2027, 2, 28)
+    assert _add_months(date(2028, 1, 31), 1) == date(2028, 2, 29)
+
+
+def test_detects_a_monthly_subscription():
+    detector = RecurringDetector()
+    detector.add(monthly(1, "Netflix", "12.99", start=date(2026, 1, 15), category_id=4))
+    [series] = detector.series()
+    assert (series.key, series.frequency) == ("netflix", "monthly")
+    assert series.amount_monthly == Decimal("12.99")
+    assert series.next_expected() == date(2026, 7, 15)
+    assert series.most_common("category_id") == 4
+    assert series.active(date(2026, 7, 30)) and not series.active(date(2026, 7, 31))
+
+
+def test_price_changes_stay_one_series_but_other_amounts_split():
+    bookings = monthly(1, "Spotify", "9.99", count=4) + monthly(10, "Spotify", "10.99", start=date(2026, 5, 31), count=2)
+    bookings.append(Booking(20, date(2026, 3, 3), Decimal("120.00"), None, None, "Spotify Geschenkkarte"))
+    detector = RecurringDetector()
+    detector.add(bookings)
+    [series] = detector.series()
+    assert len(series.bookings) == 6
+    assert series.amount == Decimal("10.99")
+
+
+def test_weekly_and_yearly_payments():
+    weekly = [Booking(i, date(2026, 9, 1) + timedelta(days=7 * i), Decimal("25"), None, None, "Putzhilfe") for i in range(5)]
+    yearly = [Booking(10 + i, date(2024 + i, 3, 15), Decimal("120"), None, None, "Kfz-Versicherung") for i in range(2)]
+    detector = RecurringDetector()
+    detector.add(weekly + yearly)
+    found = {s.key: s for s in detector.series()}
+    assert found["putzhilfe"].frequency == "weekly"
+    assert found["putzhilfe"].amount_monthly == Decimal("108.33")
+    assert found["kfz versicherung"].frequency == "yearly"
+    assert found["kfz versicherung"].amount_monthly == Decimal("10.00")
+
+
+def test_irregular_bookings_are_not_recurring():
+    days = [date(2026, 1, 2), date(2026, 1, 9), date(2026, 3, 20), date(2026, 3, 22), date(2026, 7, 1)]
+    detector = RecurringDetector()
+    detector.add(Booking(i, day, Decimal("30"), None, None, "Tankstelle") for i, day in enumerate(days, 1))
+    assert detector.series() == []
+
+
+def test_watermark_skips_seen_rows_and_reevaluates_new_ones():
+    detector = RecurringDetector()
+    bookings = monthly(1, "Fitnessstudio", "29.90", count=2)
+    detector.add(bookings)
+    assert detector.series() == []  # two months are not enough yet
+    detector.add(bookings + monthly(3, "Fitnessstudio", "29.90", start=date(2026, 3, 31), count=1))
+    [series] = detector.series()
+    assert detector.watermark == 3
+    assert [b.id for b in series.bookings] == [1, 2, 3]
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from app import main
+from app.main import UNCATEGORIZED, TransactionTypeEnum, _dashboard, _rollup_deltas
+from app.reports import TransactionColumns, build_report
+
+EXPENSE, INCOME = TransactionTypeEnum.expense, TransactionTypeEnum.income
+
+ROWS = [  # (date, category_id, type, amount)
+    (date(2026, 10, 1), 1, INCOME, Decimal("3000.00")),
+    (date(2026, 10, 3), None, INCOME, Decimal("150.00")),
+    (date(2026, 10, 5), 2, EXPENSE, Decimal("45.10")),
+    (date(2026, 10, 9), None, EXPENSE, Decimal("19.99")),
+    (date(2026, 10, 20), None, EXPENSE, Decimal("5.01")),
+]
+
+
+class FakeResult(list):
+    def all(self):
+        return list(self)
+
+
+class FakeSession:
+    """Answers ``_dashboard``'s queries in order with canned rows."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+
+    async def execute(self, statement):
+        return FakeResult(self.results.pop(0))
+
+    async def scalars(self, statement):
+        return FakeResult(self.results.pop(0))
+
+
+def test_rollup_deltas_keep_uncategorized_rows():
+    deltas = _rollup_deltas(ROWS)
+    assert deltas[(date(2026, 10, 1), UNCATEGORIZED, EXPENSE)] == [Decimal("25.00"), 2]
+    assert deltas[(date(2026, 10, 1), UNCATEGORIZED, INCOME)] == [Decimal("150.00"), 1]
+    assert deltas[(date(2026, 10, 1), 2, EXPENSE)] == [Decimal("45.10"), 1]
+
+
+def test_rollup_deltas_reverse_to_zero():
+    deltas = _rollup_deltas(ROWS)
+    _rollup_deltas(ROWS, sign=-1, deltas=deltas)
+    assert all(total == 0 and count == 0 for total, count in deltas.values())
+
+
+def test_rollup_deltas_move_between_months():
+    old = [(date(2026, 9, 30), 2, "expense", Decimal("10"))]
+    new = [(date(2026, 10, 1), None, "expense", Decimal("10"))]
+    deltas = _rollup_deltas(old, sign=-1)
+    _rollup_deltas(new, deltas=deltas)
+    assert deltas == {
+        (date(2026, 9, 1), 2, EXPENSE): [Decimal("-10"), -1],
+        (date(2026, 10, 1), UNCATEGORIZED, EXPENSE): [Decimal("10"), 1],
+    }
+
+
+def test_dashboard_totals_match_reports_with_uncategorized_rows():
+    rollups = [(category_id, kind, total) for (_, category_id, kind), (total, _) in _rollup_deltas(ROWS).items()]
+    dashboard = asyncio.run(_dashboard(FakeSession(rollups, [], []), 1, date(2026, 10, 1)))
+
+    columns = TransactionColumns(
+        np.array([int(amount * 100) for *_, amount in ROWS], np.int64),
+        np.array([(day - date(1970, 1, 1)).days for day, *_ in ROWS], np.int32),
+        np.array([category_id or 0 for _, category_id, _, _ in ROWS], np.int32),
+        np.array([kind == INCOME for _, _, kind, _ in ROWS]),
+    )
+    report = build_report(columns, date(2026, 10, 31), 1, {})
+
+    assert dashboard["total_income"] == report["totals"]["income"] == 3150.0
+    assert dashboard["total_expenses"] == report["totals"]["expenses"] == 70.1
+    assert dashboard["total_savings"] == report["totals"]["savings"] == 3079.9
+
+
+class RebuildSession:
+    def __init__(self):
+        self.statements = []
+        self.committed = self.rolled_back = False
+
+    async def execute(self, statement):
+        self.statements.append(str(statement))
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def _rebuild(monkeypatch, before, after, **kwargs):
+    mismatches = iter([before, after])
+    bumped = []
+
+    async def fake_mismatches(db, user_id=None):
+        return next(mismatches)
+
+    async def fake_bump(db, user_id):
+        bumped.append(user_id)
+        return 1
+
+    monkeypatch.setattr(main, "_rollup_mismatches", fake_mismatches)
+    monkeypatch.setattr(main, "_bump_data_version", fake_bump)
+    db = RebuildSession()
+    result = asyncio.run(main.rebuild_rollups(db, **kwargs))
+    return db, result, bumped
+
+
+MONTH = date(2026, 10, 1)
+BEFORE = [
+    ((3, MONTH, 1, EXPENSE), (Decimal("10"), 1), (Decimal("12"), 2)),
+    ((3, MONTH, 0, EXPENSE), None, (Decimal("5"), 1)),
+    ((8, MONTH, 2, INCOME), (Decimal("1"), 1), None),
+]
+
+
+def test_rebuild_bumps_data_version_of_changed_users(monkeypatch):
+    db, result, bumped = _rebuild(monkeypatch, BEFORE, [])
+    assert db.committed and bumped == [3, 8]
+    assert result["mismatched_before"] == 3 and result["mismatched_after"] == 0
+    # The users rows are locked before the transactions table, like in every write path
+    assert "FOR UPDATE" in db.statements[1] and "LOCK TABLE transactions" in db.statements[2]
+
+
+def test_rebuild_check_only_writes_nothing(monkeypatch):
+    db, result, bumped = _rebuild(monkeypatch, BEFORE, [], check_only=True)
+    assert db.rolled_back and not db.committed and bumped == []
+    assert not any("FOR UPDATE" in s for s in db.statements)
+    assert result["mismatched_after"] == 3
+
+
+def test_rebuild_that_still_mismatches_is_rolled_back(monkeypatch):
+    db, result, bumped = _rebuild(monkeypatch, BEFORE, BEFORE[:1])
+    assert db.rolled_back and not db.committed and bumped == []
@@ -0,0 +1,136 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.categorize import Categorizer, Rule
+from app.statements import (
+    BatchValidator, RawStatementRow, StatementFormat, _mt940_description, batched, detect_format, parse_statement,
+)
+
+
+def test_mt940_description_separates_counterparty_subfields():
+    info = "166?00SEPA-LASTSCHRIFT?20EREF+123?21Einkauf vom 01.10?3212345?33REWE Markt"
+    assert _mt940_description(info) == "12345 REWE Markt EREF+123Einkauf vom 01.10"
+
+
+def test_mt940_description_without_subfields():
+    assert _mt940_description("  Miete Oktober ") == "Miete Oktober"
+    assert _mt940_description("?00GUTSCHRIFT?32Arbeitgeber GmbH") == "Arbeitgeber GmbH"
+
+
+def test_validate_batch_rejects_control_characters():
+    validator = BatchValidator(1, None)
+    result = validator.validate_batch([
+        RawStatementRow(2, "2026-10-01", "-5,00", "REWE\x00Markt"),
+        RawStatementRow(3, "2026-10-02", "-7,50", "Bäcker\r\nMüller\tFiliale"),
+    ])
+    assert result.rejected == 1
+    assert result.errors == [{"line": 2, "error": "control character '\\x00' in description"}]
+    assert [r[5] for r in result.records] == ["Bäcker  Müller Filiale"]
+
+
+def _rows(data: bytes, fmt: StatementFormat, encoding: str = "utf-8-sig") -> list[RawStatementRow]:
+    return list(parse_statement(io.BytesIO(data), fmt, encoding))
+
+
+def test_detect_format():
+    assert detect_format("auszug.xml", b"") is StatementFormat.camt053
+    assert detect_format(None, b"<Document><BkToCstmrStmt>") is StatementFormat.camt053
+    assert detect_format("konto.sta", b"") is StatementFormat.mt940
+    assert detect_format(None, b":20:STARTUMS\r\n:25:12345") is StatementFormat.mt940
+    assert detect_format("umsaetze.csv", b"Datum;Betrag") is StatementFormat.csv
+
+
+def test_parse_csv_finds_header_below_metadata():
+    data = (
+        "Kontonummer;DE00 1234\n"
+        "\n"
+        "Buchungstag;Wertstellung;Empfänger;Verwendungszweck;Betrag\n"
+        "01.10.2026;02.10.2026;REWE Markt;Einkauf;-23,45\n"
+        "02.10.2026;02.10.2026;;Gehalt;2.500,00\n"
+        "kaputt\n"
+    ).encode()
+    assert _rows(data, StatementFormat.csv) == [
+        RawStatementRow(4, "01.10.2026", "-23,45", "REWE Markt Einkauf"),
+        RawStatementRow(5, "02.10.2026", "2.500,00", "Gehalt"),
+        RawStatementRow(6, "", "", ""),
+    ]
+
+
+def test_parse_csv_soll_haben_column():
+    data = b"date,amount,description,Soll/Haben\n2026-10-01,12.00,Kiosk,S\n2026-10-02,5.00,Erstattung,H\n"
+    assert [(r.amount, r.type) for r in _rows(data, StatementFormat.csv)] == [("-12.00", None), ("5.00", None)]
+
+
+def test_parse_csv_without_header_fails():
+    with pytest.raises(ValueError):
+        _rows(b"a;b\n1;2\n", StatementFormat.csv)
+
+
+def test_parse_camt053():
+    data = b"""<?xml version="1.0"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02"><BkToCstmrStmt><Stmt>
+  <Ntry><Amt Ccy="EUR">42.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><BookgDt><Dt>2026-10-01</Dt></BookgDt>
+    <NtryDtls><TxDtls><RltdPties><Cdtr><Nm>Stadtwerke</Nm></Cdtr></RltdPties>
+      <RmtInf><Ustrd>Abschlag Strom</Ustrd><Ustrd>Oktober</Ustrd></RmtInf></TxDtls></NtryDtls></Ntry>
+  <Ntry><Amt Ccy="EUR">2500.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><BookgDt><DtTm>2026-10-02T08:00:00</DtTm></BookgDt>
+    <AddtlNtryInf>Gehalt</AddtlNtryInf></Ntry>
+</Stmt></BkToCstmrStmt></Document>"""
+    assert _rows(data, StatementFormat.camt053) == [
+        RawStatementRow(1, "2026-10-01", "-42.00", "Stadtwerke Abschlag Strom Oktober"),
+        RawStatementRow(2, "2026-10-02", "2500.00", "Gehalt"),
+    ]
+
+
+def test_parse_mt940_with_continuation_lines():
+    data = (
+        ":20:STARTUMS\r\n"
+        ":25:12345678/0001234567\r\n"
+        ":61:2610011001DR23,45NMSCNONREF\r\n"
+        ":86:106?00KARTENZAHLUNG?20Einkauf\r\n"
+        "?3212345?33REWE Märkt\r\n"
+        ":61:2610021002CR2500,NTRFNONREF\r\n"
+        ":86:Gehalt Oktober\r\n"
+        ":62F:C261031EUR1000,00\r\n"
+        "-\r\n"
+    ).encode("latin-1")
+    assert _rows(data, StatementFormat.mt940) == [
+        RawStatementRow(3, "2026-10-01", "-23,45", "12345 REWE Märkt Einkauf"),
+        RawStatementRow(6, "2026-10-02", "2500,", "Gehalt Oktober"),
+    ]
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
+
+
+def test_validate_batch_parses_dates_amounts_and_types():
+    categorizer = Categorizer([Rule(1, 1, "keyword", "rewe")])
+    validator = BatchValidator(7, 99, categorize=categorizer.categorize_many)
+    result = validator.validate_batch([
+        RawStatementRow(1, "01.10.2026", "-1.234,56", "REWE"),
+        RawStatementRow(2, "2026-10-02", "2,500.00", "Gehalt"),
+        RawStatementRow(3, "02.10.26", "10", "Erstattung", "expense"),
+        RawStatementRow(4, "32.10.2026", "5", "x"),
+        RawStatementRow(5, "2026-10-03", "abc", "x"),
+        RawStatementRow(6, "2026-10-03", "0,00", "x"),
+        RawStatementRow(7, "2026-10-03", "100000000", "x"),
+    ])
+    assert [(r[0], r[2], r[3], r[4], r[6]) for r in result.records] == [
+        (7, 1, Decimal("1234.56"), date(2026, 10, 1), "expense"),
+        (7, 99, Decimal("2500.00"), date(2026, 10, 2), "income"),
+        (7, 99, Decimal("10.00"), date(2026, 10, 2), "expense"),
+    ]
+    assert result.rejected == 4
+    assert [e["line"] for e in result.errors] == [4, 5, 6, 7]
+
+
+def test_validate_batch_caps_reported_errors():
+    validator = BatchValidator(1, None, max_errors=2)
+    bad = [RawStatementRow(i, "kein Datum", "1", "x") for i in range(3)]
+    assert len(validator.validate_batch(bad).errors) == 2
+    result = validator.validate_batch(bad)
+    assert (result.rejected, result.errors) == (3, [])
@@ -0,0 +1,114 @@
+"""Requests/second through tc_auth's BaseHTTPMiddleware vs. pure ASGI middleware.
+
+Runs entirely in-process (httpx ASGITransport, no sockets) against a small
+FastAPI app with a JSON endpoint and a streaming endpoint, once anonymous and
+once with a valid session cookie (RS256 token signed by a local key, JWKS
+pre-seeded so nothing talks to an identity server).
+
+    python benchmarks/bench_middleware.py [--requests 5000] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "core"))
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from jose import jwk, jwt
+
+from tc_auth import TcAuth, TcSession, TcTokens, TcUser
+
+
+def _signing_material() -> tuple[bytes, dict]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk["kid"] = "bench"
+    return private_pem, public_jwk
+
+
+def build_app(pure_asgi: bool, private_pem: bytes, public_jwk: dict) -> tuple[FastAPI, str]:
+    app = FastAPI()
+    auth = TcAuth(
+        client_id="bench",
+        client_secret="bench",
+        redirect_uri="http://bench/auth/callback",
+        identity_url="http://identity.invalid",
+        session_secret="bench-secret",
+        pure_asgi_middleware=pure_asgi,
+    )
+    auth.setup(app)
+    auth.oauth._jwks = {"bench": public_jwk}
+    auth.oauth._jwks_fetched_at = time.time()
+
+    @app.get("/api/items")
+    async def items() -> list[dict]:
+        return [{"id": i, "amount": "12.50"} for i in range(20)]
+
+    @app.get("/api/stream")
+    async def stream() -> StreamingResponse:
+        async def rows():
+            for i in range(50):
+                yield f"{i},12.50\n"
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    expires_at = int(time.time()) + 3600
+    token = jwt.encode({"sub": "bench", "exp": expires_at}, private_pem, algorithm="RS256", headers={"kid": "bench"})
+    session = TcSession(
+        tokens=TcTokens(access_token=token, refresh_token="refresh", expires_at=expires_at),
+        user=TcUser(sub="bench", username="bench"),
+    )
+    return app, auth.oauth.encode_session(session)
+
+
+async def measure(app: FastAPI, path: str, cookies: dict, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", cookies=cookies) as client:
+        async def worker(n: int) -> None:
+            for _ in range(n):
+                r = await client.get(path)
+                assert r.status_code == 200, r.status_code
+
+        await worker(50)  # warm-up (fills the token claims cache)
+        per_worker = total // concurrency
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        return per_worker * concurrency / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    private_pem, public_jwk = _signing_material()
+    apps = {
+        "BaseHTTPMiddleware": build_app(False, private_pem, public_jwk),
+        "pure ASGI": build_app(True, private_pem, public_jwk),
+    }
+    print(f"{'case':<34}{'BaseHTTPMiddleware':>20}{'pure ASGI':>14}{'speedup':>10}")
+    for path in ("/api/items", "/api/stream"):
+        for authenticated in (False, True):
+            results = []
+            for app, cookie in apps.values():
+                cookies = {"tc_app_session": cookie} if authenticated else {}
+                results.append(await measure(app, path, cookies, args.requests, args.concurrency))
+            label = f"{path} ({'session' if authenticated else 'anonymous'})"
+            print(f"{label:<34}{results[0]:>16.0f} r/s{results[1]:>10.0f} r/s{results[1] / results[0]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
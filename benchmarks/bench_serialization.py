@@ -0,0 +1,80 @@
+"""Serializing a page of transactions: FastAPI's default path vs. FastJSONResponse.
+
+"default" is what the list endpoints did before: ORM objects are converted
+with ``TransactionResponse.model_validate(from_attributes=True)``, FastAPI
+validates them against ``response_model`` again, runs ``jsonable_encoder``
+and renders with ``json.dumps``. "fast" is the current path: column tuples
+zipped into dicts and rendered by orjson. No database involved.
+
+    python benchmarks/bench_serialization.py [--rows 50000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.main import TRANSACTION_FIELDS, Transaction, TransactionResponse, TransactionTypeEnum
+from app.serialization import FastJSONResponse
+
+
+def make_rows(n: int) -> list[tuple]:
+    start, created = date(2020, 1, 1), datetime(2024, 1, 1, 12, 0, 0)
+    return [
+        (
+            i, i % 7 or None, i % 23 + 1, Decimal(f"{i % 5000}.{i % 100:02d}"), start + timedelta(days=i % 1500),
+            f"Kartenzahlung REWE Markt {i}", TransactionTypeEnum.income if i % 9 == 0 else TransactionTypeEnum.expense,
+            created + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def default_path(objects: list, field) -> bytes:
+    items = [TransactionResponse.model_validate(t, from_attributes=True) for t in objects]
+    content = asyncio.run(serialize_response(field=field, response_content=items, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def fast_path(rows: list[tuple]) -> bytes:
+    return FastJSONResponse(TRANSACTION_FIELDS.dicts(rows)).body
+
+
+def best_of(repeat: int, fn, *args) -> tuple[float, bytes]:
+    timings, body = [], b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    objects = [Transaction(**dict(zip(TRANSACTION_FIELDS.fields, row))) for row in rows]
+    field = create_response_field(name="response", type_=List[TransactionResponse], mode="serialization")
+
+    default_s, default_body = best_of(args.repeat, default_path, objects, field)
+    fast_s, fast_body = best_of(args.repeat, fast_path, rows)
+    print(f"{args.rows} TransactionResponse rows, best of {args.repeat}")
+    print(f"  default  {default_s * 1000:8.1f} ms  {len(default_body) / 1e6:.1f} MB")
+    print(f"  fast     {fast_s * 1000:8.1f} ms  {len(fast_body) / 1e6:.1f} MB  ({default_s / fast_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ import hashlib
 import json
 import secrets
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
 
 import httpx
 from jose import jwt, JWTError
@@ -15,6 +16,52 @@ from itsdangerous import URLSafeTimedSerializer, BadSignature
 from .config import TcAuthConfig
 from .models import TcUser, TcTokens, TcSession
 
+try:
+    import h2  # noqa: F401 — enables HTTP/2 in httpx
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+class IdentityUnavailable(Exception):
+    """Raised without a network call while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures.
+
+    While open, calls fail immediately except for one probe every
+    ``reset_after`` seconds; a successful call closes it again.
+    """
+
+    def __init__(self, threshold: int, reset_after: float) -> None:
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at >= self.reset_after:
+            self.opened_at = now  # this caller probes, everyone else keeps failing fast
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
 
 class OAuthClient:
     """Handles all OAuth 2.0 operations including PKCE, token exchange, and JWKS validation."""
@@ -24,33 +71,118 @@ class OAuthClient:
         self._signer = URLSafeTimedSerializer(config.session_secret)
         self._jwks: dict[str, Any] = {}
         self._jwks_fetched_at: float = 0
-        self._jwks_lock = asyncio.Lock()
+        self._jwks_generation = 0  # bumped whenever the key set changes
+        self._jwks_forced_at: float = 0  # last refetch caused by an unknown kid
+        self._unknown_kids: dict[str, float] = {}  # kid -> negative-cached until
+        # sha256(access token) -> (exp, claims), least recently used first
+        self._claims_cache: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        # sha256(session cookie) -> (valid until, session), least recently used first
+        self._session_cache: OrderedDict[bytes, tuple[float, TcSession]] = OrderedDict()
+        self.session_cache_hits = 0
+        self.session_cache_misses = 0
+        # sha256(refresh token) -> in-flight refresh / (reuse until, result)
+        self._refresh_inflight: dict[bytes, asyncio.Task[TcTokens]] = {}
+        self._refresh_results: dict[bytes, tuple[float, TcTokens]] = {}
         self._discovery: dict[str, str] = {}
-        self._discovery_lock = asyncio.Lock()
+        self._discovery_fetched_at: float = 0
+        self._fetches: dict[str, asyncio.Task[None]] = {}  # single-flight discovery/JWKS fetches
+        self._refresher: Optional[asyncio.Task[None]] = None
         self._http: Optional[httpx.AsyncClient] = None
+        self.breaker = CircuitBreaker(config.breaker_failure_threshold, config.breaker_reset_seconds)
 
     @property
     def http(self) -> httpx.AsyncClient:
         if self._http is None or self._http.is_closed:
-            self._http = httpx.AsyncClient(verify=False, timeout=10.0)
+            self._http = httpx.AsyncClient(
+                verify=False,
+                timeout=self.config.http_timeout,
+                limits=httpx.Limits(
+                    max_connections=self.config.http_max_connections,
+                    max_keepalive_connections=self.config.http_max_keepalive,
+                    keepalive_expiry=self.config.http_keepalive_expiry,
+                ),
+                http2=self.config.http2 and _HTTP2_AVAILABLE,
+            )
         return self._http
 
+    async def _request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+        """Identity-service call through the shared pool and the circuit breaker.
+
+        Transport errors and 5xx responses count as failures; 4xx answers
+        mean the service is up and close the breaker.
+        """
+        if not self.breaker.allow():
+            raise IdentityUnavailable(f"identity service unavailable, not calling {url}")
+        try:
+            r = await self.http.request(
+                method, url, timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT, **kwargs
+            )
+        except httpx.TransportError:
+            self.breaker.record_failure()
+            raise
+        if r.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return r
+
+    async def start(self) -> None:
+        """Prefetch discovery and JWKS in the background and keep them fresh."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._keep_fresh())
+
     async def close(self) -> None:
+        if self._refresher:
+            self._refresher.cancel()
         if self._http and not self._http.is_closed:
             await self._http.aclose()
 
+    def _fetch_once(self, name: str, fetch: Callable[[], Awaitable[None]]) -> "asyncio.Task[None]":
+        """Start ``fetch`` unless one with the same name is already running."""
+        task = self._fetches.get(name)
+        if task is None or task.done():
+            task = asyncio.create_task(fetch())
+            # Background fetches may never be awaited; failures just keep the stale data
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._fetches[name] = task
+        return task
+
+    async def _keep_fresh(self) -> None:
+        while True:
+            try:
+                if time.time() - self._discovery_fetched_at >= self.config.discovery_ttl:
+                    await self._fetch_once("discovery", self._fetch_discovery)
+                if time.time() - self._jwks_fetched_at >= self.config.jwks_ttl - self.config.jwks_refresh_ahead:
+                    await self._fetch_once("jwks", self._fetch_jwks)
+                now = time.time()
+                delay = min(
+                    self._discovery_fetched_at + self.config.discovery_ttl,
+                    self._jwks_fetched_at + self.config.jwks_ttl - self.config.jwks_refresh_ahead,
+                ) - now
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                delay = 30  # IdP unreachable: keep serving what we have, retry soon
+            await asyncio.sleep(max(delay, 1))
+
     # --- Discovery ---
 
+    async def _fetch_discovery(self) -> None:
+        r = await self._request(
+            "GET", f"{self.config.identity_url}/.well-known/openid-configuration", timeout=self.config.jwks_timeout
+        )
+        r.raise_for_status()
+        self._discovery = r.json()
+        self._discovery_fetched_at = time.time()
+
     async def discover(self) -> dict[str, str]:
+        """OpenID configuration; once stale it is served while refetching in the background."""
         if self._discovery:
+            if time.time() - self._discovery_fetched_at >= self.config.discovery_ttl:
+                self._fetch_once("discovery", self._fetch_discovery)
             return self._discovery
-        async with self._discovery_lock:
-            if self._discovery:
-                return self._discovery
-            r = await self.http.get(f"{self.config.identity_url}/.well-known/openid-configuration")
-            r.raise_for_status()
-            self._discovery = r.json()
-            return self._discovery
+        await asyncio.shield(self._fetch_once("discovery", self._fetch_discovery))
+        return self._discovery
 
     async def _endpoint(self, key: str) -> str:
         d = await self.discover()
@@ -95,7 +227,7 @@ class OAuthClient:
 
     async def exchange_code(self, code: str, code_verifier: str) -> TcTokens:
         token_ep = await self._endpoint("token_endpoint")
-        r = await self.http.post(token_ep, data={
+        r = await self._request("POST", token_ep, timeout=self.config.token_timeout, data={
             "grant_type": "authorization_code",
             "code": code,
             "redirect_uri": self.config.redirect_uri,
@@ -114,8 +246,39 @@ class OAuthClient:
         )
 
     async def refresh_tokens(self, refresh_token: str) -> TcTokens:
+        """Refresh tokens, coalescing concurrent refreshes of the same token.
+
+        Parallel requests carrying the same (about to expire) session all
+        await a single call to the token endpoint, and callers arriving
+        within ``refresh_reuse_seconds`` afterwards get the same result
+        instead of presenting an already rotated refresh token again.
+        """
+        key = hashlib.sha256(refresh_token.encode()).digest()
+        cached = self._refresh_results.get(key)
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+
+        task = self._refresh_inflight.get(key)
+        if task is None:
+            # A separate task, so a cancelled first caller does not fail the others
+            task = asyncio.create_task(self._refresh_tokens(refresh_token))
+            self._refresh_inflight[key] = task
+            task.add_done_callback(lambda t: self._refresh_done(key, t))
+        return await asyncio.shield(task)
+
+    def _refresh_done(self, key: bytes, task: "asyncio.Task[TcTokens]") -> None:
+        self._refresh_inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        now = time.time()
+        for stale in [k for k, (until, _) in self._refresh_results.items() if until <= now]:
+            del self._refresh_results[stale]
+        if self.config.refresh_reuse_seconds > 0:
+            self._refresh_results[key] = (now + self.config.refresh_reuse_seconds, task.result())
+
+    async def _refresh_tokens(self, refresh_token: str) -> TcTokens:
         token_ep = await self._endpoint("token_endpoint")
-        r = await self.http.post(token_ep, data={
+        r = await self._request("POST", token_ep, timeout=self.config.token_timeout, data={
             "grant_type": "refresh_token",
             "refresh_token": refresh_token,
             "client_id": self.config.client_id,
@@ -137,7 +300,7 @@ class OAuthClient:
         except KeyError:
             revoke_ep = f"{self.config.identity_url}/oauth/revoke"
         try:
-            await self.http.post(revoke_ep, data={
+            await self._request("POST", revoke_ep, timeout=self.config.token_timeout, data={
                 "token": token,
                 "client_id": self.config.client_id,
                 "client_secret": self.config.client_secret,
@@ -152,27 +315,68 @@ class OAuthClient:
             jwks_uri = await self._endpoint("jwks_uri")
         except KeyError:
             jwks_uri = f"{self.config.identity_url}/oauth/jwks"
-        r = await self.http.get(jwks_uri)
+        r = await self._request("GET", jwks_uri, timeout=self.config.jwks_timeout)
         r.raise_for_status()
         data = r.json()
-        self._jwks = {k["kid"]: k for k in data.get("keys", [])}
+        jwks = {k["kid"]: k for k in data.get("keys", [])}
+        if jwks != self._jwks:
+            # Keys rotated: claims verified against the old set must be re-checked
+            self._jwks_generation += 1
+            self._claims_cache.clear()
+            self._unknown_kids.clear()
+        self._jwks = jwks
         self._jwks_fetched_at = time.time()
 
     async def get_jwk(self, kid: str) -> dict[str, Any]:
-        # Return cached if fresh
-        if kid in self._jwks and (time.time() - self._jwks_fetched_at) < 3600:
-            return self._jwks[kid]
-        # Refresh
-        async with self._jwks_lock:
-            if kid in self._jwks and (time.time() - self._jwks_fetched_at) < 3600:
-                return self._jwks[kid]
-            await self._fetch_jwks()
-        if kid not in self._jwks:
+        """Key for ``kid`` from the cached JWKS.
+
+        Known kids never wait on the IdP: close to ``jwks_ttl`` the set is
+        refetched in the background while the cached keys keep being served.
+        An unknown kid triggers at most one refetch per
+        ``jwks_unknown_kid_interval`` and is negatively cached in between.
+        """
+        now = time.time()
+        key = self._jwks.get(kid)
+        if key is not None:
+            if now - self._jwks_fetched_at >= self.config.jwks_ttl - self.config.jwks_refresh_ahead:
+                self._fetch_once("jwks", self._fetch_jwks)
+            return key
+
+        if self._unknown_kids.get(kid, 0) > now:
             raise ValueError(f"Unknown kid: {kid}")
-        return self._jwks[kid]
+        interval = self.config.jwks_unknown_kid_interval
+        inflight = self._fetches.get("jwks")
+        running = inflight is not None and not inflight.done()
+        if running or now - self._jwks_forced_at >= interval:
+            if not running:
+                self._jwks_forced_at = now
+            await asyncio.shield(self._fetch_once("jwks", self._fetch_jwks))
+            key = self._jwks.get(kid)
+            if key is not None:
+                return key
+
+        if len(self._unknown_kids) >= 1024:
+            self._unknown_kids = {k: until for k, until in self._unknown_kids.items() if until > now}
+        self._unknown_kids[kid] = now + interval
+        raise ValueError(f"Unknown kid: {kid}")
 
     async def validate_token(self, token: str) -> dict[str, Any]:
-        """Validate access token using cached JWKS. Returns claims."""
+        """Validate access token using cached JWKS. Returns claims.
+
+        Verified claims are kept in a bounded LRU keyed by the token's SHA-256
+        until the token's ``exp`` or the next JWKS rotation, so repeated
+        requests with the same token skip header parsing and RSA verification.
+        """
+        cache_key = hashlib.sha256(token.encode()).digest()
+        cached = self._claims_cache.get(cache_key)
+        if cached is not None:
+            exp, claims = cached
+            if time.time() < exp:
+                self._claims_cache.move_to_end(cache_key)
+                return dict(claims)
+            self._claims_cache.pop(cache_key, None)
+
+        generation = self._jwks_generation
         headers = jwt.get_unverified_headers(token)
         kid = headers.get("kid", "")
         key = await self.get_jwk(kid)
@@ -182,6 +386,16 @@ class OAuthClient:
             algorithms=["RS256"],
             options={"verify_aud": False},
         )
+
+        exp = claims.get("exp")
+        if (
+            self.config.token_cache_size > 0
+            and isinstance(exp, (int, float))
+            and generation == self._jwks_generation
+        ):
+            self._claims_cache[cache_key] = (float(exp), dict(claims))
+            while len(self._claims_cache) > self.config.token_cache_size:
+                self._claims_cache.popitem(last=False)
         return claims
 
     # --- User Info ---
@@ -191,7 +405,9 @@ class OAuthClient:
             userinfo_ep = await self._endpoint("userinfo_endpoint")
         except KeyError:
             userinfo_ep = f"{self.config.identity_url}/oauth/userinfo"
-        r = await self.http.get(userinfo_ep, headers={"Authorization": f"Bearer {access_token}"})
+        r = await self._request(
+            "GET", userinfo_ep, timeout=self.config.token_timeout, headers={"Authorization": f"Bearer {access_token}"}
+        )
         r.raise_for_status()
         data = r.json()
         return TcUser(
@@ -202,6 +418,17 @@ class OAuthClient:
             scope=data.get("scope", ""),
         )
 
+    async def validate_sso_ticket(self, ticket: str) -> Optional[dict[str, Any]]:
+        """User info for a valid SSO ticket, ``None`` if the ticket is rejected."""
+        r = await self._request(
+            "POST", f"{self.config.identity_url}/api/sso/validate",
+            timeout=self.config.sso_timeout, json={"ticket": ticket},
+        )
+        if r.status_code != 200:
+            return None
+        data = r.json()
+        return data["user"] if data.get("valid") else None
+
     def user_from_claims(self, claims: dict[str, Any]) -> TcUser:
         return TcUser(
             sub=claims.get("sub", ""),
@@ -213,12 +440,69 @@ class OAuthClient:
 
     # --- Session Cookie ---
 
+    # Compact cookies are a positional list tagged with a version number
+    _COMPACT_V1 = 1
+
     def encode_session(self, session: TcSession) -> str:
+        if self.config.session_encoding == "compact":
+            t, u = session.tokens, session.user
+            data: Any = [self._COMPACT_V1, t.access_token, t.refresh_token, t.expires_at, t.id_token,
+                         u.sub, u.username, u.role, u.email, u.scope]
+            while data[-1] is None:
+                data.pop()
+            return self._signer.dumps(data)
         return self._signer.dumps(session.model_dump())
 
+    @classmethod
+    def _session_from_data(cls, data: Any) -> TcSession:
+        if isinstance(data, list) and data and data[0] == cls._COMPACT_V1:
+            access, refresh, expires_at, id_token, sub, username, role, email, scope = (data[1:] + [None] * 9)[:9]
+            return TcSession(
+                tokens=TcTokens(access_token=access, refresh_token=refresh, id_token=id_token, expires_at=expires_at),
+                user=TcUser(sub=sub, username=username, role=role or "user", email=email, scope=scope or ""),
+            )
+        return TcSession(**data)
+
     def decode_session(self, cookie: str) -> Optional[TcSession]:
+        """Verify and decode a session cookie.
+
+        Decoded sessions are cached by the cookie's SHA-256 until the cookie's
+        ``cookie_max_age`` or the access token's expiry, whichever is first,
+        so repeated requests skip the HMAC check, JSON parse and model build.
+        The returned session may be shared between requests: treat it as
+        read-only.
+        """
+        size = self.config.session_cache_size
+        cache_key = hashlib.sha256(cookie.encode()).digest() if size > 0 else b""
+        if size > 0:
+            cached = self._session_cache.get(cache_key)
+            if cached is not None:
+                if time.time() < cached[0]:
+                    self._session_cache.move_to_end(cache_key)
+                    self.session_cache_hits += 1
+                    return cached[1]
+                self._session_cache.pop(cache_key, None)
+            self.session_cache_misses += 1
+
         try:
-            data = self._signer.loads(cookie, max_age=self.config.cookie_max_age)
-            return TcSession(**data)
+            data, signed_at = self._signer.loads(cookie, max_age=self.config.cookie_max_age, return_timestamp=True)
+            session = self._session_from_data(data)
         except (BadSignature, Exception):
             return None
+
+        if size > 0:
+            valid_until = min(signed_at.timestamp() + self.config.cookie_max_age, session.tokens.expires_at)
+            if valid_until > time.time():
+                self._session_cache[cache_key] = (valid_until, session)
+                while len(self._session_cache) > size:
+                    self._session_cache.popitem(last=False)
+        return session
+
+    def session_cache_stats(self) -> dict[str, int]:
+        """Hit/miss counters for sizing ``session_cache_size``."""
+        return {
+            "hits": self.session_cache_hits,
+            "misses": self.session_cache_misses,
+            "size": len(self._session_cache),
+            "max_size": self.config.session_cache_size,
+        }
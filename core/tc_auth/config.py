@@ -17,6 +17,28 @@ class TcAuthConfig:
     cookie_samesite: str = "lax"
     public_paths: list[str] = field(default_factory=lambda: ["/health", "/api/version"])
     scopes: str = "openid profile"
+    # Shared HTTP pool for all identity-service calls
+    http_max_connections: int = 100
+    http_max_keepalive: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2: bool = False  # needs the h2 package (httpx[http2]); ignored without it
+    http_timeout: float = 10.0
+    token_timeout: float = 10.0
+    jwks_timeout: float = 5.0
+    sso_timeout: float = 5.0
+    # Fail fast once the identity service looks down; probe again after the reset delay
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+    jwks_ttl: int = 3600  # seconds before the JWKS counts as stale (stale keys are still served)
+    jwks_refresh_ahead: int = 300  # refresh in the background this long before jwks_ttl
+    jwks_unknown_kid_interval: int = 60  # min seconds between refetches caused by unknown kids
+    discovery_ttl: int = 86400
+    session_cache_size: int = 1024  # decoded session cookies kept in memory; 0 disables
+    session_encoding: str = "json"  # "compact" writes positional, smaller cookies; both are always readable
+    token_cache_size: int = 1024  # verified access-token claims kept in memory; 0 disables
+    refresh_reuse_seconds: int = 30  # refreshed tokens handed to late callers with the old refresh token
+    # Opt-in: True installs the pure ASGI middleware instead of BaseHTTPMiddleware
+    pure_asgi_middleware: bool = False
 
     def __post_init__(self) -> None:
         self.identity_url = self.identity_url.rstrip("/")
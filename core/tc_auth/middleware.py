@@ -3,14 +3,16 @@
 import secrets
 import time
 from typing import Any, Callable, Optional
+from urllib.parse import urlencode, parse_qs, urlparse, urlunparse
 
 from fastapi import FastAPI, Request, Response, Depends, HTTPException
 from fastapi.responses import RedirectResponse, JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .client import OAuthClient
 from .config import TcAuthConfig
-from .models import TcUser, TcSession
+from .models import TcUser, TcTokens, TcSession
 
 
 def _wants_json(request: Request) -> bool:
@@ -118,13 +120,83 @@ class TcAuth:
             resp.delete_cookie(self.config.cookie_name)
             return resp
 
+        # Warm discovery + JWKS before the first request needs them
+        @app.on_event("startup")
+        async def _startup() -> None:
+            await self.oauth.start()
+
         # Shutdown
         @app.on_event("shutdown")
         async def _shutdown() -> None:
             await self.oauth.close()
 
         # Add middleware
-        app.add_middleware(_TcAuthMiddleware, tc_auth=self)
+        if self.config.pure_asgi_middleware:
+            app.add_middleware(_TcAuthASGIMiddleware, tc_auth=self)
+        else:
+            app.add_middleware(_TcAuthMiddleware, tc_auth=self)
+
+    def is_public(self, path: str) -> bool:
+        return path.startswith("/auth/") or path in self.config.public_paths
+
+    def set_session_cookie(self, response: Response, session: TcSession) -> None:
+        response.set_cookie(
+            self.config.cookie_name,
+            self.oauth.encode_session(session),
+            httponly=True,
+            secure=self.config.cookie_secure,
+            samesite=self.config.cookie_samesite,
+            max_age=self.config.cookie_max_age,
+        )
+
+    def session_cookie_header(self, session: TcSession) -> tuple[bytes, bytes]:
+        """Raw ``set-cookie`` header for ``session``, for middlewares rewriting ASGI messages."""
+        response = Response()
+        self.set_session_cookie(response, session)
+        return response.raw_headers[-1]
+
+    async def sso_login(self, request: Request) -> Optional[Response]:
+        """Exchange an ``_sso`` ticket for a local session (iframe authentication).
+
+        Returns a redirect to the same URL without ``_sso`` that sets the
+        session cookie, or ``None`` to continue with the normal flow.
+        """
+        sso_ticket = request.query_params.get("_sso")
+        if not sso_ticket:
+            return None
+        existing_session = await self.get_session(request)
+        if existing_session:
+            return None
+        try:
+            user_info = await self.oauth.validate_sso_ticket(sso_ticket)
+            if user_info is None:
+                return None
+            # Create a local session (same as after OAuth callback) with a
+            # placeholder token: the user is authenticated via SSO ticket
+            sso_user = TcUser(
+                sub=user_info["sub"],
+                username=user_info["username"],
+                role=user_info.get("role", "user"),
+                email=user_info.get("email"),
+                scope="openid profile",
+            )
+            sso_tokens = TcTokens(
+                access_token="sso-ticket-auth",
+                refresh_token="sso-ticket-auth",
+                expires_at=int(time.time()) + 86400,
+            )
+            sso_session = TcSession(tokens=sso_tokens, user=sso_user)
+            # Build redirect URL without _sso param
+            parsed = urlparse(str(request.url))
+            params = parse_qs(parsed.query, keep_blank_values=True)
+            params.pop("_sso", None)
+            new_query = urlencode(params, doseq=True)
+            clean_url = urlunparse(parsed._replace(query=new_query))
+            resp = RedirectResponse(clean_url, status_code=302)
+            self.set_session_cookie(resp, sso_session)
+            return resp
+        except Exception:
+            return None  # SSO failed, continue normal flow
 
     async def get_session(self, request: Request) -> Optional[TcSession]:
         """Extract and validate session from request. Auto-refreshes if needed."""
@@ -172,65 +244,14 @@ class _TcAuthMiddleware(BaseHTTPMiddleware):
         self.tc_auth = tc_auth
 
     async def dispatch(self, request: Request, call_next: Any) -> Response:
-        path = request.url.path
-
         # Skip auth routes and public paths
-        if path.startswith("/auth/") or path in self.tc_auth.config.public_paths:
+        if self.tc_auth.is_public(request.url.path):
             return await call_next(request)
 
         # --- SSO Ticket handling (for iframe authentication) ---
-        sso_ticket = request.query_params.get("_sso")
-        if sso_ticket:
-            existing_session = await self.tc_auth.get_session(request)
-            if not existing_session:
-                try:
-                    import httpx as _httpx
-                    async with _httpx.AsyncClient(verify=False, timeout=5.0) as client:
-                        resp = await client.post(
-                            f"{self.tc_auth.config.identity_url}/api/sso/validate",
-                            json={"ticket": sso_ticket},
-                        )
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        if data.get("valid"):
-                            user_info = data["user"]
-                            # Create a local session (same as after OAuth callback)
-                            from .models import TcTokens, TcSession as _TcSession
-                            # Create a synthetic session with a placeholder token
-                            # The user is authenticated via SSO ticket, so we create a minimal session
-                            sso_user = TcUser(
-                                sub=user_info["sub"],
-                                username=user_info["username"],
-                                role=user_info.get("role", "user"),
-                                email=user_info.get("email"),
-                                scope="openid profile",
-                            )
-                            import time as _time
-                            sso_tokens = TcTokens(
-                                access_token="sso-ticket-auth",
-                                refresh_token="sso-ticket-auth",
-                                expires_at=int(_time.time()) + 86400,
-                            )
-                            sso_session = _TcSession(tokens=sso_tokens, user=sso_user)
-                            # Build redirect URL without _sso param
-                            from urllib.parse import urlencode, parse_qs, urlparse, urlunparse
-                            parsed = urlparse(str(request.url))
-                            params = parse_qs(parsed.query, keep_blank_values=True)
-                            params.pop("_sso", None)
-                            new_query = urlencode(params, doseq=True)
-                            clean_url = urlunparse(parsed._replace(query=new_query))
-                            resp = RedirectResponse(clean_url, status_code=302)
-                            resp.set_cookie(
-                                self.tc_auth.config.cookie_name,
-                                self.tc_auth.oauth.encode_session(sso_session),
-                                httponly=True,
-                                secure=self.tc_auth.config.cookie_secure,
-                                samesite=self.tc_auth.config.cookie_samesite,
-                                max_age=self.tc_auth.config.cookie_max_age,
-                            )
-                            return resp
-                except Exception:
-                    pass  # SSO failed, continue normal flow
+        sso_response = await self.tc_auth.sso_login(request)
+        if sso_response is not None:
+            return sso_response
 
         session = await self.tc_auth.get_session(request)
         if session:
@@ -241,18 +262,57 @@ class _TcAuthMiddleware(BaseHTTPMiddleware):
 
         # Update cookie if session was refreshed
         if hasattr(request.state, "tc_new_session"):
-            response.set_cookie(
-                self.tc_auth.config.cookie_name,
-                self.tc_auth.oauth.encode_session(request.state.tc_new_session),
-                httponly=True,
-                secure=self.tc_auth.config.cookie_secure,
-                samesite=self.tc_auth.config.cookie_samesite,
-                max_age=self.tc_auth.config.cookie_max_age,
-            )
+            self.tc_auth.set_session_cookie(response, request.state.tc_new_session)
 
         return response
 
 
+class _TcAuthASGIMiddleware:
+    """Pure ASGI equivalent of ``_TcAuthMiddleware``.
+
+    Avoids BaseHTTPMiddleware's extra task and memory stream per request:
+    the downstream app gets the original ``receive``/``send``, streaming
+    responses pass through untouched, and a refreshed session cookie is
+    added by rewriting the headers of ``http.response.start``.
+    """
+
+    def __init__(self, app: ASGIApp, tc_auth: TcAuth) -> None:
+        self.app = app
+        self.tc_auth = tc_auth
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.tc_auth.is_public(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        # Request only wraps the scope here; request.state lives in scope["state"]
+        request = Request(scope)
+        if b"_sso=" in scope.get("query_string", b""):
+            sso_response = await self.tc_auth.sso_login(request)
+            if sso_response is not None:
+                await sso_response(scope, receive, send)
+                return
+
+        session = await self.tc_auth.get_session(request)
+        if session:
+            request.state.tc_user = session.user
+            request.state.tc_session = session
+
+        new_session: Optional[TcSession] = getattr(request.state, "tc_new_session", None)
+        if new_session is None:
+            await self.app(scope, receive, send)
+            return
+
+        cookie = self.tc_auth.session_cookie_header(new_session)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), cookie]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
 def _require_auth_factory(tc_auth: TcAuth) -> Callable:
     def require_auth(role: Optional[str] = None) -> Callable:
         async def dependency(request: Request) -> TcUser: